@@ -0,0 +1,313 @@
+"""
+Quart (ASGI) Application with AWS Cognito Authentication
+
+Asyncio variant of app_cognito.py with the same routes and templates.
+MySQL access uses an aiomysql pool, Cognito calls use httpx, and
+automations run via asyncio.create_subprocess_exec, so one process can
+serve many concurrent long-running automations.
+
+Run with:
+    hypercorn app_async:app --bind 127.0.0.1:5000
+"""
+
+from quart import Quart, render_template, request, jsonify, redirect, url_for, flash, session
+from quart_cors import cors
+import aiomysql
+import asyncio
+import job_queue
+import os
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+from cognito_auth import callback_error, start_session
+from cognito_auth_async import AsyncCognitoAuth
+from resource_limits import init_cgroups, RunLimits
+from core import (DB_CONFIG, RUN_TIMEOUT, BATCH_SHARE, LOG_INSERT, load_config, find_runnable,
+                  build_command, log_values, run_result, timeout_result, validate_batch,
+                  batch_item_result, batch_response)
+from assets import init_assets
+
+load_dotenv()
+
+app = Quart(__name__, static_folder='static', template_folder='templates')
+app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
+app = cors(app)
+init_assets(app)
+
+# Sessions stay in Quart's signed cookie: the server-side store (and so
+# flask revoke-sessions) only works with the Flask apps
+if os.getenv('SESSION_BACKEND', 'cookie') != 'cookie':
+    raise RuntimeError("app_async only supports cookie sessions; unset SESSION_BACKEND "
+                       "or run app_cognito for server-side sessions")
+
+# Initialize Cognito Authentication
+cognito = AsyncCognitoAuth(app)
+
+# aiomysql takes the database name as 'db'
+AIOMYSQL_CONFIG = {('db' if k == 'database' else k): v for k, v in DB_CONFIG.items()}
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+
+# Upper bound on automations running at once in this process
+MAX_CONCURRENT_RUNS = int(os.getenv('MAX_CONCURRENT_RUNS', 200))
+
+db_pool = None
+run_slots = None
+
+
+@app.before_serving
+async def startup():
+    """Create the MySQL pool and run semaphore inside the serving loop"""
+    global db_pool, run_slots
+    run_slots = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+    try:
+        db_pool = await aiomysql.create_pool(minsize=1, maxsize=DB_POOL_SIZE,
+                                             autocommit=True, **AIOMYSQL_CONFIG)
+    except Exception as e:
+        print(f"DB connection failed: {e}")
+
+
+@app.after_serving
+async def shutdown():
+    if db_pool:
+        db_pool.close()
+        await db_pool.wait_closed()
+
+
+async def log_run(user_id, auto_id, auto_name, params, success, output, exec_time):
+    """Log automation execution to database"""
+    await log_runs([(user_id, auto_id, auto_name, params, success, output, exec_time)])
+
+
+async def log_runs(rows):
+    """Log several executions with one batched insert; rows are log_run() argument tuples"""
+    if not db_pool or not rows:
+        return
+
+    try:
+        async with db_pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(LOG_INSERT, log_values(rows))
+    except Exception as e:
+        print(f"Logging failed: {e}")
+
+
+async def run_script(cmd, profile):
+    """Run cmd under its resource profile; returns (returncode, stdout, stderr)"""
+    limits = RunLimits(profile)
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *limits.command(cmd),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), RUN_TIMEOUT)
+        except asyncio.TimeoutError:
+            limits.kill(proc)
+            await proc.wait()
+            raise
+        return proc.returncode, stdout.decode(errors='replace'), stderr.decode(errors='replace')
+    finally:
+        # rmdir of the run cgroup may have to wait for the kernel to reap it
+        await asyncio.to_thread(limits.release)
+
+
+async def execute(automation, params):
+    """Async counterpart of core.execute(); returns (response_body, status_code, log_output)"""
+    cmd = build_command(automation, params)
+    try:
+        async with run_slots:
+            return run_result(*await run_script(cmd, automation.get('resources')))
+    except asyncio.TimeoutError:
+        return timeout_result()
+
+# ============================================
+# Authentication Routes
+# ============================================
+
+@app.route('/login')
+async def login():
+    """Redirect to Cognito Hosted UI for login"""
+    if 'user' in session:
+        return redirect(url_for('index'))
+
+    return redirect(cognito.get_login_url())
+
+@app.route('/callback')
+async def callback():
+    """Handle OAuth2 callback from Cognito"""
+    error = callback_error(request.args)
+    if error:
+        await flash(error, 'error')
+        return redirect(url_for('login'))
+
+    try:
+        tokens = await cognito.exchange_code_for_tokens(request.args['code'])
+        user_data = await cognito.verify_token(tokens.get('id_token'))
+
+        if not user_data:
+            await flash('Token verification failed', 'error')
+            return redirect(url_for('login'))
+
+        await flash(start_session(session, tokens, user_data), 'success')
+        return redirect(url_for('index'))
+
+    except Exception as e:
+        print(f"Callback error: {e}")
+        await flash(f'Authentication failed: {str(e)}', 'error')
+        return redirect(url_for('login'))
+
+@app.route('/logout')
+async def logout():
+    """Logout user and clear session"""
+    session.clear()
+    await flash('Logged out successfully', 'success')
+    return redirect(cognito.get_logout_url())
+
+# ============================================
+# Application Routes
+# ============================================
+
+@app.route('/')
+@cognito.login_required
+async def index():
+    """Main application page"""
+    return await render_template('index.html', user=session.get('user'))
+
+@app.route('/api/automations')
+@cognito.login_required
+async def get_automations():
+    """Get list of available automations"""
+    try:
+        return jsonify(load_config()['automations'])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/run', methods=['POST'])
+@cognito.login_required
+async def run_automation():
+    """Execute an automation script"""
+    start = datetime.now()
+    user = session.get('user')
+    auto_id = 'unknown'
+    params = {}
+    automation = {}
+
+    try:
+        data = await request.get_json()
+        # job_queue uses blocking mysql.connector calls
+        if await asyncio.to_thread(job_queue.use_queue, data):
+            body, status = await asyncio.to_thread(job_queue.submit, user['id'], data)
+            return jsonify(body), status
+
+        auto_id = data.get('automation_id')
+        params = data.get('parameters', {})
+
+        automation, error = find_runnable(auto_id)
+        if error:
+            return jsonify(error[0]), error[1]
+
+        body, status, output = await execute(automation, params)
+        exec_time = (datetime.now() - start).total_seconds()
+
+        await log_run(user['id'], auto_id, automation['name'], params,
+                      body.get('success', False), output, exec_time)
+        return jsonify(body), status
+
+    except Exception as e:
+        exec_time = (datetime.now() - start).total_seconds()
+        await log_run(user['id'], auto_id, (automation or {}).get('name', 'Unknown'),
+                      params, False, str(e), exec_time)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/run/batch', methods=['POST'])
+@cognito.login_required
+async def run_batch():
+    """Execute one automation over a list of parameter sets"""
+    start = time.monotonic()
+    user = session.get('user')
+    data = await request.get_json(silent=True)
+    if await asyncio.to_thread(job_queue.use_queue, data):
+        body, status = await asyncio.to_thread(job_queue.submit_batch, user['id'], data)
+        return jsonify(body), status
+
+    automation, items = validate_batch(data)
+    if automation is None:
+        body, status = items
+        return jsonify(body), status
+
+    # Per-batch share on top of the process-wide run_slots
+    batch_slots = asyncio.Semaphore(BATCH_SHARE)
+
+    async def run_item(index, params):
+        item_start = time.monotonic()
+        try:
+            if not isinstance(params, dict):
+                raise ValueError('Parameters must be an object')
+            async with batch_slots:
+                body, status, output = await execute(automation, params)
+        except Exception as e:
+            body, status, output = {'error': str(e)}, 500, str(e)
+        return batch_item_result(index, params, body, status), output, time.monotonic() - item_start
+
+    outcomes = await asyncio.gather(*(run_item(i, p) for i, p in enumerate(items)))
+
+    body, log_rows = batch_response(user['id'], automation, outcomes, start)
+    await log_runs(log_rows)
+    return jsonify(body)
+
+@app.route('/api/jobs/<int:job_id>')
+@cognito.login_required
+async def get_job(job_id):
+    """Status and, once finished, result of a queued run"""
+    body, status = await asyncio.to_thread(job_queue.job_status, job_id, session.get('user')['id'])
+    return jsonify(body), status
+
+@app.route('/api/batches/<batch_id>')
+@cognito.login_required
+async def get_batch(batch_id):
+    """Progress and, once finished, results of a queued batch"""
+    body, status = await asyncio.to_thread(job_queue.batch_status, batch_id, session.get('user')['id'])
+    return jsonify(body), status
+
+@app.route('/api/user')
+@cognito.login_required
+async def get_user():
+    """Get current user information"""
+    return jsonify(session.get('user'))
+
+# ============================================
+# Health Check Routes
+# ============================================
+
+@app.route('/health')
+async def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat(),
+        'auth_method': 'cognito',
+        'server': 'asgi'
+    })
+
+# ============================================
+# Initialization
+# ============================================
+
+# Create necessary directories on startup
+for d in ['scripts', 'templates', 'static/js', 'static/css', 'log']:
+    os.makedirs(d, exist_ok=True)
+
+# Give automation runs their own cgroups when the service has a delegated subtree
+init_cgroups()
+
+if __name__ == '__main__':
+    # Development mode
+    print(f"\nAutomation UI (ASGI) running on http://localhost:5000")
+    print(f"Authentication: AWS Cognito")
+    print(f"DB: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}\n")
+
+    app.run(debug=True, host='0.0.0.0', port=5000)
+else:
+    # Production mode
+    print(f"Production mode (ASGI): Cognito Auth | DB={DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
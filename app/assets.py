@@ -0,0 +1,34 @@
+"""
+Fingerprinted Static Assets
+
+`npm run build` writes minified, content-hashed copies of the JS/CSS into
+static/dist/ together with a manifest.json mapping each source name to its
+hashed file. Templates call asset_url('js/app.js') and get the hashed URL
+when the manifest exists, or the plain static URL during development.
+"""
+
+import json
+from pathlib import Path
+
+MANIFEST_PATH = Path(__file__).parent / 'static' / 'dist' / 'manifest.json'
+
+
+def load_manifest():
+    """Load the build manifest, or an empty mapping if assets are not built"""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def init_assets(app):
+    """Register the asset_url() template helper on a Flask (or Quart) app"""
+    manifest = load_manifest()
+
+    def asset_url(name):
+        # Re-read in debug mode so rebuilt assets are picked up without a restart
+        mapping = load_manifest() if app.debug else manifest
+        return f"{app.static_url_path}/{mapping.get(name, name)}"
+
+    app.jinja_env.globals['asset_url'] = asset_url
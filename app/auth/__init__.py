@@ -0,0 +1,51 @@
+"""
+Pluggable Authentication Backends
+
+A backend registers its own /login and /logout routes (plus any OAuth
+callback) and provides login_required() and current_user() for the shared
+application routes. Backends are imported lazily by name, so the database
+deployment never imports boto3/jose and the Cognito deployment never
+imports bcrypt/flask_login.
+"""
+
+import importlib
+
+BACKENDS = {
+    'db': 'auth.database:DatabaseAuth',
+    'cognito': 'auth.cognito:CognitoBackend',
+}
+
+
+class AuthBackend:
+    """Interface implemented by every authentication backend"""
+
+    name = None
+
+    # Session storage used when SESSION_BACKEND is not set
+    # ('cookie' = Flask's signed cookie, or a session_store backend)
+    default_session_backend = 'cookie'
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the backend's routes and hooks on the app"""
+        raise NotImplementedError
+
+    def login_required(self, f):
+        """Decorator that only lets authenticated requests through"""
+        raise NotImplementedError
+
+    def current_user(self):
+        """Dict with id, username, email and full_name of the logged-in user"""
+        raise NotImplementedError
+
+
+def load_backend(name):
+    """Import and return the backend class registered under name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown auth backend '{name}' (choose from: {', '.join(BACKENDS)})")
+
+    module_name, class_name = BACKENDS[name].split(':')
+    return getattr(importlib.import_module(module_name), class_name)
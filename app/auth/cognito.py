@@ -0,0 +1,71 @@
+"""
+AWS Cognito Authentication Backend
+
+OAuth2 login through the Cognito Hosted UI (see cognito_auth.py).
+"""
+
+from flask import request, redirect, url_for, flash, session
+
+from auth import AuthBackend
+from cognito_auth import CognitoAuth, get_current_user, callback_error, start_session
+
+
+class CognitoBackend(AuthBackend):
+    name = 'cognito'
+
+    # Tokens are several KB; keep them server-side instead of in the cookie
+    default_session_backend = 'mysql'
+
+    def init_app(self, app):
+        self.cognito = CognitoAuth(app)
+
+        app.add_url_rule('/login', 'login', self.login)
+        app.add_url_rule('/callback', 'callback', self.callback)
+        app.add_url_rule('/logout', 'logout', self.logout)
+
+    def login(self):
+        """Redirect to Cognito Hosted UI for login"""
+        if 'user' in session:
+            return redirect(url_for('index'))
+
+        login_url = self.cognito.get_login_url()
+        return redirect(login_url)
+
+    def callback(self):
+        """Handle OAuth2 callback from Cognito"""
+        error = callback_error(request.args)
+        if error:
+            flash(error, 'error')
+            return redirect(url_for('login'))
+
+        try:
+            # Exchange code for tokens, then verify and decode the ID token
+            tokens = self.cognito.exchange_code_for_tokens(request.args['code'])
+            user_data = self.cognito.verify_token(tokens.get('id_token'))
+
+            if not user_data:
+                flash('Token verification failed', 'error')
+                return redirect(url_for('login'))
+
+            flash(start_session(session, tokens, user_data), 'success')
+            return redirect(url_for('index'))
+
+        except Exception as e:
+            print(f"Callback error: {e}")
+            flash(f'Authentication failed: {str(e)}', 'error')
+            return redirect(url_for('login'))
+
+    def logout(self):
+        """Logout user and clear session"""
+        session.clear()
+        flash('Logged out successfully', 'success')
+
+        # Redirect to Cognito logout
+        logout_url = self.cognito.get_logout_url()
+        return redirect(logout_url)
+
+    def login_required(self, f):
+        return self.cognito.login_required(f)
+
+    def current_user(self):
+        return get_current_user()
@@ -0,0 +1,194 @@
+"""
+Database Authentication Backend
+
+Username/password login against the MySQL users table (bcrypt hashes),
+with Flask-Login managing the session. Password checks go through
+login_guard (bounded bcrypt pool, rate limiting, hash upgrades).
+
+The user record is cached in the signed session at login, so requests do
+not query the users table. Each worker re-checks a user's is_active flag
+and session_version at most once per USER_CACHE_TTL seconds; deactivating
+a user or bumping session_version
+(UPDATE users SET session_version = session_version + 1 WHERE id = ...)
+logs them out everywhere within that window.
+"""
+
+from flask import render_template, request, redirect, url_for, flash, session
+from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
+import os
+import time
+from datetime import datetime
+
+from auth import AuthBackend, login_guard
+from auth.login_guard import LoginThrottled
+from core import get_db
+
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))
+
+# user_id -> (checked_at, session_version, or None if inactive/deleted)
+_user_checks = {}
+
+
+class User(UserMixin):
+    def __init__(self, id, username, email, full_name, version=0):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.full_name = full_name
+        self.version = version
+
+    def to_session(self):
+        return {
+            'id': self.id,
+            'username': self.username,
+            'email': self.email,
+            'full_name': self.full_name,
+            'version': self.version
+        }
+
+
+def fetch_user(user_id):
+    """Load an active user from the database as a session dict"""
+    db = get_db()
+    if not db:
+        return None
+
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("SELECT id, username, email, full_name, session_version AS version FROM users WHERE id = %s AND is_active = TRUE", (user_id,))
+    user_data = cursor.fetchone()
+    cursor.close()
+    db.close()
+
+    if user_data:
+        _user_checks[user_data['id']] = (time.monotonic(), user_data['version'])
+    return user_data
+
+
+def current_session_version(user_id):
+    """session_version of an active user (None if inactive), cached per worker"""
+    checked = _user_checks.get(user_id)
+    if checked and time.monotonic() - checked[0] < USER_CACHE_TTL:
+        return checked[1]
+
+    db = get_db()
+    if not db:
+        return None
+
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("SELECT session_version FROM users WHERE id = %s AND is_active = TRUE", (user_id,))
+    row = cursor.fetchone()
+    cursor.close()
+    db.close()
+
+    version = row['session_version'] if row else None
+    _user_checks[user_id] = (time.monotonic(), version)
+    return version
+
+
+def load_user(user_id):
+    user_data = session.get('user')
+    if not user_data or str(user_data['id']) != str(user_id):
+        # Session predates identity caching: load the record once and keep it
+        user_data = fetch_user(user_id)
+        if not user_data:
+            return None
+        session['user'] = user_data
+
+    if current_session_version(user_data['id']) != user_data['version']:
+        session.pop('user', None)
+        return None
+
+    return User(user_data['id'], user_data['username'], user_data['email'],
+                user_data['full_name'], user_data['version'])
+
+
+def verify_user(username, password, ip):
+    """Check credentials; raises LoginThrottled when the attempt is refused"""
+    login_guard.check_allowed(username, ip)
+
+    db = get_db()
+    if not db:
+        return None
+
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("SELECT id, username, password_hash, email, full_name, session_version FROM users WHERE username = %s AND is_active = TRUE", (username,))
+    user = cursor.fetchone()
+
+    try:
+        if user and login_guard.check_password(username, password, user['password_hash']):
+            login_guard.record_success(username)
+
+            new_hash = login_guard.upgraded_hash(password, user['password_hash'])
+            if new_hash:
+                cursor.execute("UPDATE users SET last_login = %s, password_hash = %s WHERE id = %s",
+                               (datetime.now(), new_hash, user['id']))
+            else:
+                cursor.execute("UPDATE users SET last_login = %s WHERE id = %s", (datetime.now(), user['id']))
+            db.commit()
+            return User(user['id'], user['username'], user['email'], user['full_name'],
+                        user['session_version'])
+
+        login_guard.record_failure(username, ip)
+        return None
+    finally:
+        cursor.close()
+        db.close()
+
+
+class DatabaseAuth(AuthBackend):
+    name = 'database'
+
+    def init_app(self, app):
+        login_manager = LoginManager()
+        login_manager.init_app(app)
+        login_manager.login_view = 'login'
+        login_manager.user_loader(load_user)
+
+        app.add_url_rule('/login', 'login', self.login, methods=['GET', 'POST'])
+        app.add_url_rule('/logout', 'logout', login_required(self.logout))
+
+    def login(self):
+        if current_user.is_authenticated:
+            return redirect(url_for('index'))
+
+        if request.method == 'POST':
+            username = request.form.get('username')
+            password = request.form.get('password')
+
+            if not username or not password:
+                flash('Username and password required', 'error')
+                return render_template('login.html')
+
+            try:
+                user = verify_user(username, password, request.remote_addr)
+            except LoginThrottled as e:
+                flash(str(e), 'error')
+                return render_template('login.html'), 429
+
+            if user:
+                if hasattr(session, 'regenerate'):
+                    session.regenerate()
+                login_user(user)
+                session['user'] = user.to_session()
+                return redirect(request.args.get('next') or url_for('index'))
+
+            flash('Invalid credentials', 'error')
+
+        return render_template('login.html')
+
+    def logout(self):
+        logout_user()
+        session.pop('user', None)
+        flash('Logged out', 'success')
+        return redirect(url_for('login'))
+
+    def login_required(self, f):
+        return login_required(f)
+
+    def current_user(self):
+        return {
+            'id': current_user.id,
+            'username': current_user.username,
+            'email': current_user.email,
+            'full_name': current_user.full_name
+        }
@@ -0,0 +1,196 @@
+"""
+Login Guard for Password Authentication
+
+Keeps bcrypt verification from monopolising the web workers:
+
+- checkpw/hashpw run on a small bounded thread pool (bcrypt releases the
+  GIL), so with threaded Gunicorn workers other requests keep being served;
+- at most BCRYPT_MAX_CONCURRENCY hashes run at once, with a short queue
+  behind them; anything beyond that is rejected immediately as "busy".
+  Each waiting login holds its request thread, so logins in flight are
+  also kept below WEB_THREADS (Gunicorn's --threads) to leave a thread
+  for other requests, and a login that times out keeps its slot until
+  its hash has actually finished;
+- failed attempts are rate limited per username and per client IP, and a
+  repeat of a password that just failed is rejected without hashing;
+- hashes below BCRYPT_MIN_ROUNDS are upgraded after a successful login.
+
+All of this state is per process: with N Gunicorn workers an attacker can
+get up to N x LOGIN_MAX_FAILURES attempts per window, depending on which
+worker each request lands on. Size the limits with that in mind.
+"""
+
+import hashlib
+import heapq
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import bcrypt
+
+BCRYPT_MAX_CONCURRENCY = int(os.getenv('BCRYPT_MAX_CONCURRENCY', 2))
+BCRYPT_QUEUE_SIZE = int(os.getenv('BCRYPT_QUEUE_SIZE', 4))
+BCRYPT_MIN_ROUNDS = int(os.getenv('BCRYPT_MIN_ROUNDS', 12))
+BCRYPT_TIMEOUT = 10
+WEB_THREADS = int(os.getenv('WEB_THREADS', 4))
+BCRYPT_MAX_IN_FLIGHT = max(1, min(BCRYPT_MAX_CONCURRENCY + BCRYPT_QUEUE_SIZE, WEB_THREADS - 1))
+
+LOGIN_MAX_FAILURES = int(os.getenv('LOGIN_MAX_FAILURES', 5))
+LOGIN_IP_MAX_FAILURES = int(os.getenv('LOGIN_IP_MAX_FAILURES', 20))
+LOGIN_WINDOW = int(os.getenv('LOGIN_WINDOW', 300))
+# Usernames/IPs tracked per limiter; beyond this the stalest are forgotten
+LOGIN_TRACKED_KEYS = int(os.getenv('LOGIN_TRACKED_KEYS', 10000))
+
+
+class LoginThrottled(Exception):
+    """Raised when a login attempt is refused before checking the password"""
+
+
+class FailureLimiter:
+    """Sliding-window count of recent failures per key
+
+    Expired keys are swept once per window, and the map never holds more
+    than max_keys keys, so a credential-stuffing run over many usernames
+    cannot grow it without bound.
+    """
+
+    def __init__(self, max_failures, window, max_keys=LOGIN_TRACKED_KEYS):
+        self.max_failures = max_failures
+        self.window = window
+        self.max_keys = max_keys
+        self._failures = {}
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def _prune(self, key, now):
+        failures = self._failures.get(key)
+        while failures and now - failures[0] > self.window:
+            failures.popleft()
+        if failures is not None and not failures:
+            del self._failures[key]
+        return failures
+
+    def _sweep(self, now):
+        for key in list(self._failures):
+            self._prune(key, now)
+
+        # Still full: forget the keys whose last failure is oldest, down to 90%
+        excess = len(self._failures) - int(self.max_keys * 0.9)
+        if len(self._failures) >= self.max_keys and excess > 0:
+            for key in heapq.nsmallest(excess, self._failures, key=lambda k: self._failures[k][-1]):
+                del self._failures[key]
+        self._next_sweep = now + self.window
+
+    def blocked(self, key):
+        with self._lock:
+            failures = self._prune(key, time.monotonic())
+            return bool(failures) and len(failures) >= self.max_failures
+
+    def record(self, key):
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_sweep or len(self._failures) >= self.max_keys:
+                self._sweep(now)
+            self._prune(key, now)
+            self._failures.setdefault(key, deque()).append(now)
+
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+_executor = ThreadPoolExecutor(max_workers=BCRYPT_MAX_CONCURRENCY, thread_name_prefix='bcrypt')
+_slots = threading.BoundedSemaphore(BCRYPT_MAX_IN_FLIGHT)
+
+_user_failures = FailureLimiter(LOGIN_MAX_FAILURES, LOGIN_WINDOW)
+_ip_failures = FailureLimiter(LOGIN_IP_MAX_FAILURES, LOGIN_WINDOW)
+
+# Fingerprints of (username, password, hash) combinations that just failed.
+# Keyed with a per-process secret so nothing here is reusable offline.
+_fingerprint_key = os.urandom(32)
+_recent_bad = {}
+_recent_bad_lock = threading.Lock()
+
+
+def _run_bcrypt(fn, *args):
+    """Run a bcrypt call on the pool, or refuse if the pool is saturated"""
+    if not _slots.acquire(blocking=False):
+        raise LoginThrottled('Too many logins in progress, please try again')
+    try:
+        future = _executor.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    # Released when the hash finishes, not when we stop waiting for it,
+    # so timed-out work cannot pile up on the pool
+    future.add_done_callback(lambda _: _slots.release())
+
+    try:
+        return future.result(timeout=BCRYPT_TIMEOUT)
+    except TimeoutError:
+        raise LoginThrottled('Login timed out, please try again')
+
+
+def _fingerprint(username, password, password_hash):
+    h = hashlib.blake2b(key=_fingerprint_key, digest_size=16)
+    for part in (username, password, password_hash):
+        h.update(part.encode())
+        h.update(b'\0')
+    return h.digest()
+
+
+def check_allowed(username, ip):
+    """Raise LoginThrottled if this username or IP has failed too often"""
+    if _user_failures.blocked(username) or _ip_failures.blocked(ip):
+        raise LoginThrottled('Too many failed attempts, please try again later')
+
+
+def record_failure(username, ip):
+    _user_failures.record(username)
+    _ip_failures.record(ip)
+
+
+def record_success(username):
+    _user_failures.reset(username)
+
+
+def check_password(username, password, password_hash):
+    """bcrypt.checkpw off the request thread, short-circuiting known-bad repeats"""
+    fingerprint = _fingerprint(username, password, password_hash)
+    now = time.monotonic()
+    with _recent_bad_lock:
+        expires = _recent_bad.get(fingerprint)
+        if expires and expires > now:
+            return False
+
+    if _run_bcrypt(bcrypt.checkpw, password.encode(), password_hash.encode()):
+        return True
+
+    with _recent_bad_lock:
+        # Drop expired entries so the map stays bounded by the window
+        for key in [k for k, v in _recent_bad.items() if v <= now]:
+            del _recent_bad[key]
+        _recent_bad[fingerprint] = now + LOGIN_WINDOW
+    return False
+
+
+def hash_rounds(password_hash):
+    """Cost factor of a $2a$/$2b$/$2y$ hash"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def upgraded_hash(password, password_hash):
+    """New hash at BCRYPT_MIN_ROUNDS if the stored one is weaker, else None"""
+    if hash_rounds(password_hash) >= BCRYPT_MIN_ROUNDS:
+        return None
+    try:
+        new_hash = _run_bcrypt(bcrypt.hashpw, password.encode(), bcrypt.gensalt(BCRYPT_MIN_ROUNDS))
+    except LoginThrottled:
+        # Not worth failing a good login over; retry on the next one
+        return None
+    return new_hash.decode()
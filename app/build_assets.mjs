@@ -0,0 +1,74 @@
+// Builds minified, content-hashed static assets into static/dist/
+//
+//   static/dist/app.<hash>.js        (+ .gz, .br)
+//   static/dist/style.<hash>.css     (+ .gz, .br)
+//   static/dist/login.<hash>.css     (+ .gz, .br)
+//   static/dist/manifest.json        source name -> hashed name
+//
+// The manifest is read by assets.py so templates reference the hashed
+// files, which nginx serves directly with immutable cache headers.
+
+import { build } from 'esbuild';
+import { createHash } from 'crypto';
+import { brotliCompressSync, gzipSync, constants } from 'zlib';
+import fs from 'fs';
+import path from 'path';
+
+const DIST_DIR = 'static/dist';
+
+// Manifest key (as used in templates) -> source entry point
+const ENTRIES = {
+    'js/app.js': 'src/app.ts',
+    'css/style.css': 'static/css/style.css',
+    'css/login.css': 'static/css/login.css',
+};
+
+function contentHash(contents) {
+    return createHash('sha256').update(contents).digest('hex').slice(0, 12);
+}
+
+function writeCompressed(file, contents) {
+    fs.writeFileSync(file, contents);
+    fs.writeFileSync(`${file}.gz`, gzipSync(contents, { level: 9 }));
+    fs.writeFileSync(`${file}.br`, brotliCompressSync(contents, {
+        params: { [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY },
+    }));
+}
+
+async function buildEntry(entryPoint) {
+    const result = await build({
+        entryPoints: [entryPoint],
+        bundle: true,
+        minify: true,
+        format: entryPoint.endsWith('.ts') ? 'esm' : undefined,
+        target: 'es2020',
+        write: false,
+        outdir: DIST_DIR,
+        logLevel: 'warning',
+    });
+    return result.outputFiles[0].contents;
+}
+
+async function main() {
+    fs.rmSync(DIST_DIR, { recursive: true, force: true });
+    fs.mkdirSync(DIST_DIR, { recursive: true });
+
+    const manifest = {};
+
+    for (const [name, entryPoint] of Object.entries(ENTRIES)) {
+        const contents = await buildEntry(entryPoint);
+        const ext = path.extname(name);
+        const hashed = `${path.basename(name, ext)}.${contentHash(contents)}${ext}`;
+
+        writeCompressed(path.join(DIST_DIR, hashed), contents);
+        manifest[name] = `dist/${hashed}`;
+        console.log(`${name} -> dist/${hashed} (${contents.length} bytes)`);
+    }
+
+    fs.writeFileSync(path.join(DIST_DIR, 'manifest.json'), JSON.stringify(manifest, null, 2) + '\n');
+}
+
+main().catch(err => {
+    console.error(err);
+    process.exit(1);
+});
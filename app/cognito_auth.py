@@ -2,17 +2,84 @@
 AWS Cognito Authentication Module for Flask
 
 This module handles OAuth2 authentication flow with AWS Cognito.
+
+ID tokens that are within TOKEN_REFRESH_MARGIN seconds of expiry are
+renewed with the stored refresh_token. With server-side sessions the
+refresh runs in the background and is written back to the session store;
+requests only wait for it once the token has actually expired. At most
+one refresh per session is in flight, and a failed one is not retried
+for TOKEN_REFRESH_RETRY seconds.
 """
 
+import hashlib
 import os
+import threading
+import time
 import requests
-import boto3
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from jose import jwt, JWTError
 from functools import wraps
-from flask import session, redirect, url_for, request, jsonify
+from flask import current_app, session, redirect, url_for, request, jsonify
 from datetime import datetime, timedelta
 import json
 
+TOKEN_REFRESH_MARGIN = int(os.getenv('TOKEN_REFRESH_MARGIN', 300))
+TOKEN_REFRESH_RETRY = 60
+TOKEN_REFRESH_TIMEOUT = 10
+
+
+class TokenRefresher:
+    """Single-flight refresh_token grants, keyed by session"""
+
+    def __init__(self, cognito, max_workers=4):
+        self.cognito = cognito
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='token-refresh')
+        # key -> (started, future); failed refreshes are kept for
+        # TOKEN_REFRESH_RETRY so late requests don't retry at once
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, refresh_token, store=None, sid=None):
+        """Future for this session's refresh, starting one if none is recent"""
+        now = time.monotonic()
+        with self._lock:
+            # A successful result is only handed to requests already
+            # waiting on it; later ones must not reuse its tokens once
+            # they have expired, so they start a new refresh
+            for old in [k for k, (started, future) in self._inflight.items()
+                        if future.done() and (future.cancelled() or future.result() is not None
+                                              or now - started >= TOKEN_REFRESH_RETRY)]:
+                del self._inflight[old]
+
+            entry = self._inflight.get(key)
+            if entry is None:
+                entry = (now, self._executor.submit(self._refresh, refresh_token, store, sid))
+                self._inflight[key] = entry
+            return entry[1]
+
+    def _refresh(self, refresh_token, store, sid):
+        try:
+            tokens = self.cognito.refresh_tokens(refresh_token)
+            user_data = self.cognito.verify_token(tokens.get('id_token'))
+        except Exception as e:
+            print(f"Token refresh failed: {e}")
+            return None
+
+        if not user_data:
+            return None
+
+        updates = token_session_updates(tokens, user_data, refresh_token)
+        if store is not None:
+            try:
+                record = store.load(sid)
+                if record:
+                    data = dict(record[0], **updates)
+                    store.save(sid, data, str(updates['user']['id']), record[1])
+            except Exception as e:
+                print(f"Storing refreshed tokens failed: {e}")
+        return updates
+
+
 class CognitoAuth:
     def __init__(self, app=None):
         self.app = app
@@ -31,13 +98,21 @@ class CognitoAuth:
         self.redirect_uri = f"https://{self.app_domain}/callback"
         self.logout_redirect_uri = f"https://{self.app_domain}"
 
+        # Hosted UI / OAuth2 endpoints (overridable to point at a local stub)
+        self.cognito_base_url = os.getenv('COGNITO_BASE_URL', f"https://{self.cognito_domain}")
+
         # Get JWKS URL for token verification
-        self.jwks_url = f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}/.well-known/jwks.json"
+        self.jwks_url = os.getenv(
+            'COGNITO_JWKS_URL',
+            f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}/.well-known/jwks.json"
+        )
 
         # Cache for JWKS
         self._jwks = None
         self._jwks_fetch_time = None
 
+        self.refresher = TokenRefresher(self)
+
         # Store config in app
         app.config['COGNITO_USER_POOL_ID'] = self.user_pool_id
         app.config['COGNITO_CLIENT_ID'] = self.client_id
@@ -67,7 +142,7 @@ class CognitoAuth:
         }
 
         query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-        return f"https://{self.cognito_domain}/login?{query_string}"
+        return f"{self.cognito_base_url}/login?{query_string}"
 
     def get_logout_url(self):
         """Generate Cognito Hosted UI logout URL"""
@@ -77,11 +152,11 @@ class CognitoAuth:
         }
 
         query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-        return f"https://{self.cognito_domain}/logout?{query_string}"
+        return f"{self.cognito_base_url}/logout?{query_string}"
 
     def exchange_code_for_tokens(self, code):
         """Exchange authorization code for tokens"""
-        token_url = f"https://{self.cognito_domain}/oauth2/token"
+        token_url = f"{self.cognito_base_url}/oauth2/token"
 
         data = {
             'grant_type': 'authorization_code',
@@ -98,12 +173,31 @@ class CognitoAuth:
         response.raise_for_status()
         return response.json()
 
+    def refresh_tokens(self, refresh_token):
+        """Get new ID and access tokens with the refresh_token grant"""
+        token_url = f"{self.cognito_base_url}/oauth2/token"
+
+        data = {
+            'grant_type': 'refresh_token',
+            'client_id': self.client_id,
+            'refresh_token': refresh_token
+        }
+
+        headers = {
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+
+        response = requests.post(token_url, data=data, headers=headers, timeout=TOKEN_REFRESH_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
     def verify_token(self, token, access_token=None):
         """Verify and decode JWT token"""
-        try:
-            # Get JWKS
-            jwks = self.get_jwks()
+        return self.decode_token(token, self.get_jwks())
 
+    def decode_token(self, token, jwks):
+        """Verify and decode JWT token against an already-fetched JWKS"""
+        try:
             # Get the kid from the token header
             headers = jwt.get_unverified_header(token)
             kid = headers['kid']
@@ -140,7 +234,7 @@ class CognitoAuth:
 
     def get_user_info(self, access_token):
         """Get user information from Cognito"""
-        userinfo_url = f"https://{self.cognito_domain}/oauth2/userInfo"
+        userinfo_url = f"{self.cognito_base_url}/oauth2/userInfo"
 
         headers = {
             'Authorization': f'Bearer {access_token}'
@@ -150,23 +244,62 @@ class CognitoAuth:
         response.raise_for_status()
         return response.json()
 
+    def refresh_session(self, wait):
+        """Refresh the session's tokens; True once fresh tokens are in it"""
+        refresh_token = session.get('refresh_token')
+        if not refresh_token:
+            return False
+
+        store = getattr(current_app.session_interface, 'store', None)
+        sid = getattr(session, 'sid', None)
+        if store is None or sid is None:
+            # Cookie sessions can only be updated through this response
+            store = sid = None
+            wait = True
+            key = hashlib.sha256(refresh_token.encode()).hexdigest()
+        else:
+            key = sid
+
+        future = self.refresher.submit(key, refresh_token, store, sid)
+        if not wait and not future.done():
+            return False
+
+        try:
+            updates = future.result(timeout=TOKEN_REFRESH_TIMEOUT)
+        except TimeoutError:
+            return False
+
+        if not updates:
+            return False
+        session.update(updates)
+        return True
+
+    def unauthenticated(self):
+        """API calls get a 401 the UI can act on; pages go to the login flow"""
+        if request.path.startswith('/api/'):
+            return jsonify({'error': 'Authentication required'}), 401
+        return redirect(url_for('login'))
+
     def login_required(self, f):
         """Decorator to protect routes with Cognito authentication"""
         @wraps(f)
         def decorated_function(*args, **kwargs):
             # Check if user is authenticated
             if 'user' not in session or 'id_token' not in session:
-                # Redirect to login
-                return redirect(url_for('login'))
+                return self.unauthenticated()
 
             # Verify token is still valid
             id_token = session.get('id_token')
             user_data = self.verify_token(id_token)
 
             if not user_data:
-                # Token expired or invalid, clear session and redirect to login
-                session.clear()
-                return redirect(url_for('login'))
+                # Token expired or invalid: try the refresh token before giving up
+                if not self.refresh_session(wait=True):
+                    session.clear()
+                    return self.unauthenticated()
+            elif user_data['exp'] - time.time() < TOKEN_REFRESH_MARGIN:
+                # Close to expiry: refresh in the background
+                self.refresh_session(wait=False)
 
             # Token is valid, proceed with request
             return f(*args, **kwargs)
@@ -188,3 +321,39 @@ def create_user_from_cognito(cognito_data):
         'full_name': cognito_data.get('name', ''),
         'email_verified': cognito_data.get('email_verified', False)
     }
+
+
+def callback_error(args):
+    """Message to flash when the OAuth2 callback carries no usable code, else None"""
+    if args.get('error'):
+        return f"Authentication error: {args.get('error')}"
+    if not args.get('code'):
+        return 'No authorization code received'
+    return None
+
+
+def start_session(session, tokens, user_data):
+    """Put a fresh login into the session; returns the welcome message
+
+    Server-side sessions get a new id; cookie sessions are cleared so
+    nothing from before the login carries over.
+    """
+    if hasattr(session, 'regenerate'):
+        session.regenerate()
+    else:
+        session.clear()
+    updates = token_session_updates(tokens, user_data, None)
+    session.update(updates)
+    user = updates['user']
+    return f'Welcome, {user["full_name"] or user["username"]}!'
+
+
+def token_session_updates(tokens, user_data, refresh_token):
+    """Session keys to set after a successful refresh_token grant"""
+    return {
+        'user': create_user_from_cognito(user_data),
+        'id_token': tokens['id_token'],
+        'access_token': tokens.get('access_token'),
+        # Cognito only returns a new refresh token when rotation is enabled
+        'refresh_token': tokens.get('refresh_token') or refresh_token
+    }
@@ -0,0 +1,142 @@
+"""
+AWS Cognito Authentication Module for Quart (asyncio)
+
+Same OAuth2 flow as cognito_auth.CognitoAuth, but the JWKS and token
+endpoint calls go through a shared httpx.AsyncClient so they never block
+the event loop. Sessions here are cookie-based, so a token refresh is
+awaited in the request (single-flight per refresh token) rather than
+written back in the background.
+"""
+
+import asyncio
+import hashlib
+import time
+import httpx
+from functools import wraps
+from quart import session, redirect, url_for, request, jsonify
+
+from cognito_auth import (CognitoAuth, TOKEN_REFRESH_MARGIN, TOKEN_REFRESH_RETRY,
+                          token_session_updates)
+
+JWKS_CACHE_SECONDS = 3600
+
+
+class AsyncCognitoAuth(CognitoAuth):
+    def init_app(self, app):
+        """Initialize the Cognito authentication module"""
+        super().init_app(app)
+        self.http = None
+        # refresh token hash -> (started, task); failed ones kept for TOKEN_REFRESH_RETRY
+        self._refreshing = {}
+
+        @app.before_serving
+        async def open_http_client():
+            self.http = httpx.AsyncClient(timeout=10.0)
+
+        @app.after_serving
+        async def close_http_client():
+            await self.http.aclose()
+
+    async def get_jwks(self):
+        """Fetch JWKS (JSON Web Key Set) from Cognito"""
+        # Cache JWKS for 1 hour
+        if self._jwks and self._jwks_fetch_time:
+            if time.monotonic() - self._jwks_fetch_time < JWKS_CACHE_SECONDS:
+                return self._jwks
+
+        response = await self.http.get(self.jwks_url)
+        response.raise_for_status()
+        self._jwks = response.json()
+        self._jwks_fetch_time = time.monotonic()
+        return self._jwks
+
+    async def exchange_code_for_tokens(self, code):
+        """Exchange authorization code for tokens"""
+        token_url = f"{self.cognito_base_url}/oauth2/token"
+
+        data = {
+            'grant_type': 'authorization_code',
+            'client_id': self.client_id,
+            'code': code,
+            'redirect_uri': self.redirect_uri
+        }
+
+        response = await self.http.post(token_url, data=data)
+        response.raise_for_status()
+        return response.json()
+
+    async def verify_token(self, token, access_token=None):
+        """Verify and decode JWT token"""
+        return self.decode_token(token, await self.get_jwks())
+
+    async def refresh_tokens(self, refresh_token):
+        """Get new ID and access tokens with the refresh_token grant"""
+        token_url = f"{self.cognito_base_url}/oauth2/token"
+
+        data = {
+            'grant_type': 'refresh_token',
+            'client_id': self.client_id,
+            'refresh_token': refresh_token
+        }
+
+        response = await self.http.post(token_url, data=data)
+        response.raise_for_status()
+        return response.json()
+
+    async def _refresh(self, refresh_token):
+        try:
+            tokens = await self.refresh_tokens(refresh_token)
+            user_data = await self.verify_token(tokens.get('id_token'))
+        except Exception as e:
+            print(f"Token refresh failed: {e}")
+            return None
+        return token_session_updates(tokens, user_data, refresh_token) if user_data else None
+
+    async def refresh_session(self):
+        """Refresh the session's tokens; True once fresh tokens are in it"""
+        refresh_token = session.get('refresh_token')
+        if not refresh_token:
+            return False
+
+        # Only failed refreshes are kept for TOKEN_REFRESH_RETRY; reusing a
+        # successful one would hand out its tokens after they expire
+        now = time.monotonic()
+        for old in [k for k, (started, task) in self._refreshing.items()
+                    if task.done() and (task.cancelled() or task.result() is not None
+                                        or now - started >= TOKEN_REFRESH_RETRY)]:
+            del self._refreshing[old]
+
+        key = hashlib.sha256(refresh_token.encode()).hexdigest()
+        if key not in self._refreshing:
+            self._refreshing[key] = (now, asyncio.ensure_future(self._refresh(refresh_token)))
+
+        # shield: a cancelled request must not cancel the shared refresh
+        updates = await asyncio.shield(self._refreshing[key][1])
+        if not updates:
+            return False
+        session.update(updates)
+        return True
+
+    def unauthenticated(self):
+        """API calls get a 401 the UI can act on; pages go to the login flow"""
+        if request.path.startswith('/api/'):
+            return jsonify({'error': 'Authentication required'}), 401
+        return redirect(url_for('login'))
+
+    def login_required(self, f):
+        """Decorator to protect routes with Cognito authentication"""
+        @wraps(f)
+        async def decorated_function(*args, **kwargs):
+            if 'user' not in session or 'id_token' not in session:
+                return self.unauthenticated()
+
+            user_data = await self.verify_token(session.get('id_token'))
+
+            if not user_data or user_data['exp'] - time.time() < TOKEN_REFRESH_MARGIN:
+                if not await self.refresh_session() and not user_data:
+                    session.clear()
+                    return self.unauthenticated()
+
+            return await f(*args, **kwargs)
+
+        return decorated_function
@@ -0,0 +1,274 @@
+"""
+Shared Execution Core
+
+Database access, automation config loading, command building and the
+run/log cycle used by every app variant, whatever the auth backend.
+Batches (one automation over many parameter sets) run on a shared,
+bounded thread pool and are logged with a single multi-row insert.
+The request validation, result shaping and log rows are plain functions
+so the async app (app_async.py) only supplies its own I/O.
+"""
+
+import mysql.connector
+import json
+import subprocess
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from datetime import datetime
+from dotenv import load_dotenv
+from resource_limits import run_limited
+
+load_dotenv()
+
+APP_DIR = Path(__file__).parent
+CONFIG_PATH = APP_DIR / 'config' / 'automations_config.json'
+RUN_TIMEOUT = 300
+TIMEOUT_ERROR = 'Script timed out (5 min)'
+
+# Automations running at once for batch requests, across all batches in this process
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 4))
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 500))
+# Runs one batch may have in flight, so one large batch cannot hold the whole pool
+BATCH_SHARE = int(os.getenv('BATCH_SHARE', max(1, BATCH_CONCURRENCY // 2)))
+
+LOG_INSERT = ("INSERT INTO automation_logs (user_id, automation_id, automation_name, parameters, "
+              "success, output, execution_time) VALUES (%s, %s, %s, %s, %s, %s, %s)")
+
+_batch_executor = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix='batch-run')
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', '10.20.72.84'),
+    'port': int(os.getenv('DB_PORT', 3306)),
+    'database': os.getenv('DB_NAME', 'automation_ui'),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', '')
+}
+
+
+def get_db():
+    """Get database connection"""
+    try:
+        return mysql.connector.connect(**DB_CONFIG)
+    except Exception as e:
+        print(f"DB connection failed: {e}")
+        return None
+
+
+def load_config():
+    """Load automation configuration"""
+    with open(CONFIG_PATH) as f:
+        return json.load(f)
+
+
+def find_automation(auto_id):
+    """Return the automation config entry with this id, or None"""
+    return next((a for a in load_config()['automations'] if a['id'] == auto_id), None)
+
+
+def build_command(automation, params):
+    """Build the script command line from the submitted parameters"""
+    cmd = [sys.executable, str(APP_DIR / automation['script'])]
+
+    for param in automation['parameters']:
+        val = params.get(param['name'])
+        if val is not None:
+            if param['type'] == 'checkbox':
+                if val:
+                    cmd.append(f'--{param["name"]}')
+            else:
+                cmd.extend([f'--{param["name"]}', str(val)])
+
+    return cmd
+
+
+def find_runnable(auto_id):
+    """(automation, None) for a known automation whose script exists, else (None, (error_body, status))"""
+    automation = find_automation(auto_id)
+    if not automation:
+        return None, ({'error': 'Automation not found'}, 404)
+
+    if not (APP_DIR / automation['script']).exists():
+        return None, ({'error': 'Script not found'}, 404)
+
+    return automation, None
+
+
+def log_values(rows):
+    """LOG_INSERT parameter tuples for log_run() argument tuples"""
+    return [(user_id, auto_id, auto_name, json.dumps(params), success, output, exec_time)
+            for user_id, auto_id, auto_name, params, success, output, exec_time in rows]
+
+
+def log_run(user_id, auto_id, auto_name, params, success, output, exec_time):
+    """Log automation execution to database"""
+    log_runs([(user_id, auto_id, auto_name, params, success, output, exec_time)])
+
+
+def log_runs(rows):
+    """Log several executions with one batched insert; rows are log_run() argument tuples"""
+    if not rows:
+        return
+
+    db = get_db()
+    if not db:
+        return
+
+    try:
+        cursor = db.cursor()
+        cursor.executemany(LOG_INSERT, log_values(rows))
+        db.commit()
+        cursor.close()
+        db.close()
+    except Exception as e:
+        print(f"Logging failed: {e}")
+
+
+def run_result(returncode, stdout, stderr):
+    """(response_body, status_code, log_output) of a finished script"""
+    return {
+        'success': returncode == 0,
+        'returncode': returncode,
+        'stdout': stdout,
+        'stderr': stderr
+    }, 200, stdout or stderr
+
+
+def timeout_result():
+    """(response_body, status_code, log_output) of a script that hit RUN_TIMEOUT"""
+    return {'error': TIMEOUT_ERROR}, 408, 'Timeout'
+
+
+def execute(automation, params, on_start=None):
+    """Run one automation with params; returns (response_body, status_code, log_output)"""
+    cmd = build_command(automation, params)
+    try:
+        result = run_limited(cmd, automation.get('resources'), timeout=RUN_TIMEOUT, on_start=on_start)
+    except subprocess.TimeoutExpired:
+        return timeout_result()
+
+    return run_result(result.returncode, result.stdout, result.stderr)
+
+
+def run_automation(user_id, data):
+    """Execute one /api/run request; returns (response_body, status_code)"""
+    start = datetime.now()
+    auto_id = 'unknown'
+    params = {}
+    automation = {}
+
+    try:
+        auto_id = data.get('automation_id')
+        params = data.get('parameters', {})
+
+        automation, error = find_runnable(auto_id)
+        if error:
+            return error
+
+        body, status, output = execute(automation, params)
+        exec_time = (datetime.now() - start).total_seconds()
+
+        log_run(user_id, auto_id, automation['name'], params,
+                body.get('success', False), output, exec_time)
+        return body, status
+
+    except Exception as e:
+        exec_time = (datetime.now() - start).total_seconds()
+        log_run(user_id, auto_id, automation.get('name', 'Unknown'), params, False, str(e), exec_time)
+        return {'error': str(e)}, 500
+
+
+def validate_batch(data):
+    """(automation, items) for a valid /api/run/batch body, else (None, (error_body, status))"""
+    data = data or {}
+    items = data.get('parameters')
+
+    if not isinstance(items, list) or not items:
+        return None, ({'error': 'parameters must be a non-empty list of parameter sets'}, 400)
+    if len(items) > BATCH_MAX_ITEMS:
+        return None, ({'error': f'At most {BATCH_MAX_ITEMS} parameter sets per batch'}, 400)
+
+    automation, error = find_runnable(data.get('automation_id'))
+    if error:
+        return None, error
+    return automation, items
+
+
+def batch_item_result(index, params, body, status):
+    """A batch entry's result as returned to the client"""
+    result = dict(body, index=index, status=status, parameters=params)
+    result.setdefault('success', False)
+    return result
+
+
+def batch_response(user_id, automation, outcomes, start):
+    """(response_body, log_rows) for finished batch items
+
+    outcomes are (result, log_output, exec_time) tuples in item order.
+    """
+    log_rows = [(user_id, automation['id'], automation['name'], result['parameters'],
+                 result['success'], output, exec_time)
+                for result, output, exec_time in outcomes]
+
+    results = [result for result, _, _ in outcomes]
+    succeeded = sum(1 for r in results if r['success'])
+    return {
+        'automation_id': automation['id'],
+        'results': results,
+        'summary': {
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'execution_time': round(time.monotonic() - start, 3)
+        }
+    }, log_rows
+
+
+def _run_batch_item(automation, index, params):
+    """One batch entry; returns (result, log_output, exec_time)"""
+    start = time.monotonic()
+    try:
+        if not isinstance(params, dict):
+            raise ValueError('Parameters must be an object')
+        body, status, output = execute(automation, params)
+    except Exception as e:
+        body, status, output = {'error': str(e)}, 500, str(e)
+
+    return batch_item_result(index, params, body, status), output, time.monotonic() - start
+
+
+def run_batch(user_id, data):
+    """Execute one /api/run/batch request; returns (response_body, status_code)
+
+    At most BATCH_SHARE items of this batch are queued on the shared pool
+    at a time, so concurrent batches take turns instead of running one
+    after the other.
+    """
+    start = time.monotonic()
+    automation, items = validate_batch(data)
+    if automation is None:
+        return items
+
+    outcomes = [None] * len(items)
+    pending = iter(enumerate(items))
+    running = set()
+
+    def submit_next():
+        item = next(pending, None)
+        if item is not None:
+            running.add(_batch_executor.submit(_run_batch_item, automation, *item))
+
+    for _ in range(min(BATCH_SHARE, len(items))):
+        submit_next()
+    while running:
+        done, running = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            outcome = future.result()
+            outcomes[outcome[0]['index']] = outcome
+            submit_next()
+
+    body, log_rows = batch_response(user_id, automation, outcomes, start)
+    log_runs(log_rows)
+    return body, 200
@@ -8,13 +8,25 @@ CREATE TABLE IF NOT EXISTS users (
     email VARCHAR(100),
     full_name VARCHAR(100),
     is_active BOOLEAN DEFAULT TRUE,
+    session_version INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     last_login TIMESTAMP NULL,
     INDEX (username)
 );
 
--- admin/admin123 and user/password
-INSERT INTO users (username, password_hash, email, full_name) VALUES
+-- Existing databases: add the column used to invalidate cached sessions.
+-- MySQL has no ADD COLUMN IF NOT EXISTS, so check information_schema first.
+SET @missing = (SELECT COUNT(*) = 0 FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'users' AND COLUMN_NAME = 'session_version');
+SET @ddl = IF(@missing,
+              'ALTER TABLE users ADD COLUMN session_version INT NOT NULL DEFAULT 0 AFTER is_active',
+              'DO 0');
+PREPARE migrate FROM @ddl;
+EXECUTE migrate;
+DEALLOCATE PREPARE migrate;
+
+-- admin/admin123 and user/password (kept as they are when the accounts already exist)
+INSERT IGNORE INTO users (username, password_hash, email, full_name) VALUES
 ('admin', '$2a$12$MKHU1ArAxENfkwk9hi7.Ze5O5N4MB5xRztjd6Z0b.nHrP8Ghu0gPa', 'admin@example.com', 'Administrator'),
 ('user', '$2b$12$LWfd.SaZG.n9aHpgJ8sxKeAT1oXGToLGP2IzJ91Y.er8CjIDKSi9i', 'user@example.com', 'Standard User');
 
@@ -34,4 +46,47 @@ CREATE TABLE IF NOT EXISTS automation_logs (
     INDEX (created_at)
 );
 
+-- Server-side sessions (SESSION_BACKEND=mysql, default for Cognito auth)
+CREATE TABLE IF NOT EXISTS sessions (
+    id VARCHAR(64) PRIMARY KEY,
+    user_id VARCHAR(64),
+    data MEDIUMTEXT NOT NULL,
+    expires_at BIGINT NOT NULL,
+    INDEX (user_id),
+    INDEX (expires_at)
+);
+
+-- Automation runs queued for worker nodes (EXECUTION_MODE=queue, see job_queue.py)
+CREATE TABLE IF NOT EXISTS jobs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id VARCHAR(64) NOT NULL,
+    batch_id CHAR(32) NULL,
+    automation_id VARCHAR(50) NOT NULL,
+    parameters TEXT,
+    status ENUM('queued', 'running', 'succeeded', 'failed') NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 3,
+    worker_id VARCHAR(100),
+    lease_expires_at DATETIME(3) NULL,
+    heartbeat_at DATETIME(3) NULL,
+    result MEDIUMTEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME(3) NULL,
+    finished_at DATETIME(3) NULL,
+    INDEX (status, id),
+    INDEX (status, lease_expires_at),
+    INDEX (user_id),
+    INDEX (batch_id)
+);
+
+-- Existing jobs tables: add the column that groups the jobs of one /api/run/batch
+SET @missing = (SELECT COUNT(*) = 0 FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'jobs' AND COLUMN_NAME = 'batch_id');
+SET @ddl = IF(@missing,
+              'ALTER TABLE jobs ADD COLUMN batch_id CHAR(32) NULL AFTER user_id, ADD INDEX (batch_id)',
+              'DO 0');
+PREPARE migrate FROM @ddl;
+EXECUTE migrate;
+DEALLOCATE PREPARE migrate;
+
 SELECT username, email, full_name FROM users;
@@ -0,0 +1,129 @@
+"""
+Application Factory
+
+Builds the Flask app for one authentication backend ('db' or 'cognito').
+All non-auth routes and the automation execution core are shared; the
+backend module is only imported for the backend actually in use.
+"""
+
+import click
+from flask import Flask, render_template, request, jsonify
+from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
+import os
+from datetime import datetime
+
+import core
+import job_queue
+from assets import init_assets
+from auth import load_backend
+from resource_limits import init_cgroups
+from session_store import init_session_store, revoke_user_sessions
+
+
+def create_app(auth_backend=None):
+    """Create the app; auth_backend defaults to $AUTH_BACKEND or 'db'"""
+    auth_backend = auth_backend or os.getenv('AUTH_BACKEND', 'db')
+
+    app = Flask(__name__, static_folder='static', template_folder='templates')
+    app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
+    CORS(app)
+    init_assets(app)
+
+    # nginx sets X-Forwarded-For/-Proto; needed for per-IP login limits
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1)
+
+    auth = load_backend(auth_backend)(app)
+    app.extensions['auth_backend'] = auth
+
+    # 'cookie' keeps Flask's signed-cookie session; 'sqlite'/'mysql' store it server-side
+    session_backend = os.getenv('SESSION_BACKEND', auth.default_session_backend)
+    if session_backend != 'cookie':
+        init_session_store(app, session_backend)
+
+    @app.route('/')
+    @auth.login_required
+    def index():
+        """Main application page"""
+        return render_template('index.html', user=auth.current_user())
+
+    @app.route('/api/automations')
+    @auth.login_required
+    def get_automations():
+        """Get list of available automations"""
+        try:
+            return jsonify(core.load_config()['automations'])
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/run', methods=['POST'])
+    @auth.login_required
+    def run_automation():
+        """Execute an automation script (or queue it for a worker)"""
+        user_id = auth.current_user()['id']
+        data = request.get_json(silent=True)
+        if job_queue.use_queue(data):
+            body, status = job_queue.submit(user_id, data)
+        else:
+            body, status = core.run_automation(user_id, data)
+        return jsonify(body), status
+
+    @app.route('/api/run/batch', methods=['POST'])
+    @auth.login_required
+    def run_batch():
+        """Execute one automation over a list of parameter sets (or queue them)"""
+        user_id = auth.current_user()['id']
+        data = request.get_json(silent=True)
+        if job_queue.use_queue(data):
+            body, status = job_queue.submit_batch(user_id, data)
+        else:
+            body, status = core.run_batch(user_id, data)
+        return jsonify(body), status
+
+    @app.route('/api/jobs/<int:job_id>')
+    @auth.login_required
+    def get_job(job_id):
+        """Status and, once finished, result of a queued run"""
+        body, status = job_queue.job_status(job_id, auth.current_user()['id'])
+        return jsonify(body), status
+
+    @app.route('/api/batches/<batch_id>')
+    @auth.login_required
+    def get_batch(batch_id):
+        """Progress and, once finished, results of a queued batch"""
+        body, status = job_queue.batch_status(batch_id, auth.current_user()['id'])
+        return jsonify(body), status
+
+    @app.route('/api/user')
+    @auth.login_required
+    def get_user():
+        """Get current user information"""
+        return jsonify(auth.current_user())
+
+    @app.route('/health')
+    def health_check():
+        """Health check endpoint"""
+        return jsonify({
+            'status': 'healthy',
+            'timestamp': datetime.now().isoformat(),
+            'auth_method': auth.name
+        })
+
+    @app.cli.command('revoke-sessions')
+    @click.argument('user_id')
+    def revoke_sessions(user_id):
+        """Log USER_ID out of every server-side session"""
+        if session_backend == 'cookie':
+            raise click.ClickException('Cookie sessions cannot be revoked centrally; '
+                                       'set SESSION_BACKEND=sqlite or mysql')
+        removed = revoke_user_sessions(app, user_id)
+        click.echo(f"Revoked {removed} session(s) of user {user_id}")
+
+    # Create necessary directories on startup
+    for d in ['scripts', 'templates', 'static/js', 'static/css', 'log']:
+        os.makedirs(d, exist_ok=True)
+
+    # Give automation runs their own cgroups when the service has a delegated subtree
+    init_cgroups()
+
+    return app
@@ -0,0 +1,288 @@
+"""
+MySQL Job Queue
+
+With EXECUTION_MODE=queue the web nodes only enqueue automation runs in
+the jobs table, and worker processes (worker.py) on any number of hosts
+claim them with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers
+neither block on nor double-claim the same row.
+
+A claimed job carries a lease of JOB_LEASE_SECONDS that its worker renews
+with heartbeats. When a worker dies its lease runs out and another worker
+re-claims the job, up to max_attempts claims in total, after which the
+job is failed. A script exiting non-zero is a result, not a retry.
+All times come from the database clock, so hosts need not agree on time.
+
+A batch is one job per parameter set sharing a batch_id. Automations
+marked "run_on_workers": false (those that take paths on the web node's
+filesystem) keep running inline even in queue mode, unless they are listed
+in RUN_ON_WORKERS because their paths are on storage every node mounts.
+"""
+
+import json
+import os
+import uuid
+
+from core import (TIMEOUT_ERROR, find_automation, find_runnable, get_db, validate_batch,
+                  batch_item_result)
+
+EXECUTION_MODE = os.getenv('EXECUTION_MODE', 'inline')
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 60))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+# Automation ids sent to workers despite "run_on_workers": false; set the
+# same list on web and worker nodes
+RUN_ON_WORKERS = {a.strip() for a in os.getenv('RUN_ON_WORKERS', '').split(',') if a.strip()}
+
+JOB_COLUMNS = ("id, user_id, batch_id, automation_id, parameters, status, attempts, max_attempts, "
+               "worker_id, result, created_at, started_at, finished_at")
+
+
+class QueueUnavailable(Exception):
+    """The jobs table could not be reached"""
+
+
+def connect():
+    db = get_db()
+    if not db:
+        raise QueueUnavailable('Database unavailable')
+    return db
+
+
+def runs_on_workers(automation):
+    """False for automations that must run where their paths are, i.e. on the web node"""
+    return automation.get('run_on_workers', True) or automation.get('id') in RUN_ON_WORKERS
+
+
+def use_queue(data):
+    """True if this /api/run or /api/run/batch request goes to the workers"""
+    if EXECUTION_MODE != 'queue':
+        return False
+    automation = find_automation((data or {}).get('automation_id'))
+    # Unknown ids take the inline path, which reports them
+    return bool(automation) and runs_on_workers(automation)
+
+
+def _decode(job):
+    for key in ('parameters', 'result'):
+        if job.get(key):
+            job[key] = json.loads(job[key])
+    for key in ('created_at', 'started_at', 'finished_at'):
+        if job.get(key):
+            job[key] = job[key].isoformat()
+    return job
+
+
+def _update(query, params):
+    """Run one UPDATE on a fresh connection; returns the affected row count"""
+    db = connect()
+    try:
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        db.commit()
+        count = cursor.rowcount
+        cursor.close()
+        return count
+    finally:
+        db.close()
+
+
+def enqueue(user_id, automation_id, params, max_attempts=JOB_MAX_ATTEMPTS):
+    """Insert a queued job; returns its id"""
+    db = connect()
+    try:
+        cursor = db.cursor()
+        cursor.execute(
+            "INSERT INTO jobs (user_id, automation_id, parameters, max_attempts) VALUES (%s, %s, %s, %s)",
+            (str(user_id), automation_id, json.dumps(params), max_attempts)
+        )
+        db.commit()
+        job_id = cursor.lastrowid
+        cursor.close()
+        return job_id
+    finally:
+        db.close()
+
+
+def submit(user_id, data):
+    """Queue one /api/run request; returns (response_body, status_code)"""
+    data = data or {}
+    auto_id = data.get('automation_id')
+    params = data.get('parameters', {})
+
+    automation, error = find_runnable(auto_id)
+    if error:
+        return error
+
+    try:
+        job_id = enqueue(user_id, auto_id, params)
+    except Exception as e:
+        print(f"Enqueue failed: {e}")
+        return {'error': 'Could not queue the automation'}, 503
+
+    return {'job_id': job_id, 'status': 'queued'}, 202
+
+
+def submit_batch(user_id, data, max_attempts=JOB_MAX_ATTEMPTS):
+    """Queue one /api/run/batch request as a job per parameter set; returns (response_body, status_code)"""
+    automation, items = validate_batch(data)
+    if automation is None:
+        return items
+
+    batch_id = uuid.uuid4().hex
+    try:
+        db = connect()
+        try:
+            cursor = db.cursor()
+            cursor.executemany(
+                "INSERT INTO jobs (user_id, batch_id, automation_id, parameters, max_attempts) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [(str(user_id), batch_id, automation['id'], json.dumps(params), max_attempts)
+                 for params in items]
+            )
+            db.commit()
+            cursor.close()
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"Enqueue failed: {e}")
+        return {'error': 'Could not queue the batch'}, 503
+
+    return {'batch_id': batch_id, 'status': 'queued', 'total': len(items)}, 202
+
+
+def get_job(job_id, user_id=None):
+    """Job as a dict, or None; with user_id only that user's jobs are visible"""
+    db = connect()
+    try:
+        cursor = db.cursor(dictionary=True)
+        if user_id is None:
+            cursor.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s", (job_id,))
+        else:
+            cursor.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s AND user_id = %s",
+                           (job_id, str(user_id)))
+        job = cursor.fetchone()
+        cursor.close()
+        return _decode(job) if job else None
+    finally:
+        db.close()
+
+
+def job_status(job_id, user_id):
+    """GET /api/jobs/<id>; returns (response_body, status_code)"""
+    try:
+        job = get_job(job_id, user_id)
+    except QueueUnavailable as e:
+        return {'error': str(e)}, 503
+    if not job:
+        return {'error': 'Job not found'}, 404
+    return job, 200
+
+
+def batch_status(batch_id, user_id):
+    """GET /api/batches/<id>: progress, and the /api/run/batch response shape once finished"""
+    try:
+        db = connect()
+    except QueueUnavailable as e:
+        return {'error': str(e)}, 503
+    try:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE batch_id = %s AND user_id = %s ORDER BY id",
+                       (batch_id, str(user_id)))
+        jobs = cursor.fetchall()
+        cursor.close()
+    finally:
+        db.close()
+
+    if not jobs:
+        return {'error': 'Batch not found'}, 404
+
+    # Before _decode() turns the timestamps into strings
+    finished_at = [job['finished_at'] for job in jobs if job['finished_at']]
+    elapsed = (max(finished_at) - jobs[0]['created_at']).total_seconds() if finished_at else 0.0
+    pending = sum(1 for job in jobs if job['status'] in ('queued', 'running'))
+    results = []
+    for index, job in enumerate(_decode(job) for job in jobs):
+        if job['status'] not in ('succeeded', 'failed'):
+            continue
+        body = job['result'] or {'error': 'Job finished without a result'}
+        status = 200 if 'returncode' in body else 408 if body.get('error') == TIMEOUT_ERROR else 500
+        result = batch_item_result(index, job['parameters'], body, status)
+        result['job_id'] = job['id']
+        results.append(result)
+
+    succeeded = sum(1 for r in results if r['success'])
+    return {
+        'batch_id': batch_id,
+        'automation_id': jobs[0]['automation_id'],
+        'status': 'running' if pending else 'finished',
+        'results': results,
+        'summary': {
+            'total': len(jobs),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'pending': pending,
+            'execution_time': round(elapsed, 3)
+        }
+    }, 200
+
+
+def claim(db, worker_id, lease=JOB_LEASE_SECONDS):
+    """Claim the oldest runnable job for worker_id on connection db; returns it or None
+
+    Queued jobs come first, then running jobs whose lease expired. An
+    expired job that has used up its attempts is failed instead.
+    """
+    cursor = db.cursor(dictionary=True)
+    try:
+        for runnable in ("status = 'queued'",
+                         "status = 'running' AND lease_expires_at < NOW(3)"):
+            while True:
+                cursor.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE {runnable} "
+                               "ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED")
+                job = cursor.fetchone()
+                if not job:
+                    db.commit()
+                    break
+
+                if job['attempts'] >= job['max_attempts']:
+                    error = f"Worker lost during each of {job['attempts']} attempts"
+                    cursor.execute(
+                        "UPDATE jobs SET status = 'failed', result = %s, lease_expires_at = NULL, "
+                        "finished_at = NOW(3) WHERE id = %s",
+                        (json.dumps({'error': error}), job['id'])
+                    )
+                    db.commit()
+                    continue
+
+                cursor.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker_id = %s, "
+                    "started_at = NOW(3), heartbeat_at = NOW(3), "
+                    "lease_expires_at = NOW(3) + INTERVAL %s SECOND WHERE id = %s",
+                    (worker_id, lease, job['id'])
+                )
+                db.commit()
+                job.update(status='running', attempts=job['attempts'] + 1, worker_id=worker_id)
+                return _decode(job)
+        return None
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def heartbeat(job_id, worker_id, lease=JOB_LEASE_SECONDS):
+    """Extend the lease; False if the job is no longer this worker's"""
+    return _update(
+        "UPDATE jobs SET heartbeat_at = NOW(3), lease_expires_at = NOW(3) + INTERVAL %s SECOND "
+        "WHERE id = %s AND worker_id = %s AND status = 'running'",
+        (lease, job_id, worker_id)
+    ) == 1
+
+
+def complete(job_id, worker_id, succeeded, result):
+    """Record the outcome; False (result dropped) if the lease was lost meanwhile"""
+    return _update(
+        "UPDATE jobs SET status = %s, result = %s, lease_expires_at = NULL, finished_at = NOW(3) "
+        "WHERE id = %s AND worker_id = %s AND status = 'running'",
+        ('succeeded' if succeeded else 'failed', json.dumps(result), job_id, worker_id)
+    ) == 1
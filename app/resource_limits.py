@@ -0,0 +1,245 @@
+"""
+Resource Limits for Automation Runs
+
+Each automation subprocess is placed in its own transient cgroup v2 group
+(CPU weight/quota, memory max, IO weight) when the service owns a delegated
+cgroup subtree and AUTOMATION_CGROUPS=1. Otherwise memory is capped with
+rlimits instead.
+nice/ionice are applied in both cases.
+
+The rlimit fallback is RLIMIT_AS, which is not equivalent to memory.max:
+it counts reserved address space rather than resident memory, so every
+thread's stack and malloc arena counts in full even if it is never
+touched. The fallback sets MALLOC_ARENA_MAX to keep that predictable, and
+threaded scripts should use small thread stacks (see scripts/offboard.py).
+
+All of this is done by exec'ing the script through sh/nice/ionice rather
+than in a preexec_fn, which can deadlock when the parent has other
+threads (gthread workers, the batch pool).
+
+Profiles come from the optional "resources" block of an automation in
+automations_config.json:
+
+    "resources": {
+        "cpu_weight": 20,          # cpu.weight (1-10000, default 100)
+        "cpu_quota": 50,           # percent of one CPU -> cpu.max
+        "memory_max": "512M",      # memory.max / RLIMIT_AS
+        "io_weight": 20,           # io.weight (1-10000, default 100)
+        "nice": 10,
+        "ionice_class": "idle",    # realtime | best-effort | idle
+        "ionice_level": 7          # 0-7, best-effort/realtime only
+    }
+"""
+
+import os
+import shutil
+import subprocess
+import time
+import uuid
+from pathlib import Path
+
+CGROUP_FS = Path('/sys/fs/cgroup')
+CONTROLLERS = ('cpu', 'memory', 'io')
+CPU_PERIOD_US = 100000
+
+# cpu.weight / io.weight of web/ and runs/: all runs together get a fifth
+# of the contended CPU and IO, per-run weights split that share
+WEB_WEIGHT = 100
+RUNS_WEIGHT = 20
+
+IONICE_CLASSES = {'realtime': 1, 'best-effort': 2, 'idle': 3}
+SIZE_SUFFIXES = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+# Cgroup that per-run groups are created under, set by init_cgroups()
+_runs_root = None
+
+
+def parse_size(value):
+    """Convert '512M' / '2G' / 1048576 into bytes"""
+    if isinstance(value, int):
+        return value
+    value = str(value).strip().upper()
+    if value[-1:] in SIZE_SUFFIXES:
+        return int(float(value[:-1]) * SIZE_SUFFIXES[value[-1]])
+    return int(value)
+
+
+def _write(path, value):
+    with open(path, 'w') as f:
+        f.write(str(value))
+
+
+def _own_cgroup():
+    """Return the cgroup v2 directory of the current process, or None"""
+    try:
+        with open('/proc/self/cgroup') as f:
+            for line in f:
+                if line.startswith('0::'):
+                    return CGROUP_FS / line[3:].strip().lstrip('/')
+    except OSError:
+        pass
+    return None
+
+
+def init_cgroups():
+    """Prepare the delegated cgroup subtree for automation runs.
+
+    The service cgroup (systemd unit with Delegate=yes) is split into
+    web/ for the Gunicorn processes and runs/ for automation subprocesses,
+    because cgroup v2 only allows controllers to be enabled for children
+    of a group that has no processes of its own. Safe to call from every
+    worker; returns True when per-run cgroups are available.
+
+    Opt-in with AUTOMATION_CGROUPS=1 (set by the Delegate=yes units): it
+    moves every process of the current cgroup, which outside those units
+    could be a user's shell and terminal.
+    """
+    global _runs_root
+
+    if os.getenv('AUTOMATION_CGROUPS', '0') != '1':
+        return False
+
+    current = _own_cgroup()
+    if current is None or not (CGROUP_FS / 'cgroup.controllers').exists():
+        return False
+
+    service = current.parent if current.name == 'web' else current
+    web = service / 'web'
+    runs = service / 'runs'
+
+    try:
+        web.mkdir(exist_ok=True)
+        runs.mkdir(exist_ok=True)
+
+        # Move every process (master + workers) out of the service root
+        with open(service / 'cgroup.procs') as f:
+            pids = [p for p in f.read().split() if p]
+        for pid in pids:
+            try:
+                _write(web / 'cgroup.procs', pid)
+            except ProcessLookupError:
+                pass
+
+        enabled = ' '.join(f'+{c}' for c in CONTROLLERS)
+        _write(service / 'cgroup.subtree_control', enabled)
+        _write(runs / 'cgroup.subtree_control', enabled)
+    except OSError as e:
+        print(f"cgroup setup unavailable, using rlimits: {e}")
+        return False
+
+    for name, weight in (('web', WEB_WEIGHT), ('runs', RUNS_WEIGHT)):
+        try:
+            _write(service / name / 'cpu.weight', weight)
+            _write(service / name / 'io.weight', f"default {weight}")
+        except OSError as e:
+            # io.weight needs an IO scheduler that supports it; runs still get their own groups
+            print(f"Could not set {name}/ weights: {e}")
+
+    _runs_root = runs
+    return True
+
+
+class RunLimits:
+    """Applies one resource profile to one automation subprocess"""
+
+    def __init__(self, profile=None):
+        self.profile = profile or {}
+        self.cgroup = None
+        if _runs_root is not None:
+            self.cgroup = self._create_cgroup()
+
+    def _create_cgroup(self):
+        path = _runs_root / f"run-{uuid.uuid4().hex[:12]}"
+        try:
+            path.mkdir()
+            if 'cpu_weight' in self.profile:
+                _write(path / 'cpu.weight', int(self.profile['cpu_weight']))
+            if 'cpu_quota' in self.profile:
+                quota = int(CPU_PERIOD_US * float(self.profile['cpu_quota']) / 100)
+                _write(path / 'cpu.max', f"{quota} {CPU_PERIOD_US}")
+            if 'memory_max' in self.profile:
+                _write(path / 'memory.max', parse_size(self.profile['memory_max']))
+                _write(path / 'memory.swap.max', 0)
+            if 'io_weight' in self.profile:
+                _write(path / 'io.weight', f"default {int(self.profile['io_weight'])}")
+            return path
+        except OSError as e:
+            print(f"Could not create run cgroup, using rlimits: {e}")
+            self._remove(path)
+            return None
+
+    def command(self, cmd):
+        """cmd wrapped so that it joins its cgroup (or gets its rlimit), nice and ionice
+
+        Each wrapper execs the next, so the script keeps the pid that was
+        moved into the cgroup.
+        """
+        prefix = []
+        if self.cgroup is not None:
+            prefix = ['sh', '-c', 'echo $$ > "$0" && exec "$@"', str(self.cgroup / 'cgroup.procs')]
+        elif 'memory_max' in self.profile:
+            # ulimit -v takes KiB and sets RLIMIT_AS; each glibc arena
+            # reserves 64M of address space, so cap how many there are
+            limit = parse_size(self.profile['memory_max']) // 1024
+            prefix = ['sh', '-c', 'ulimit -v "$0" && export MALLOC_ARENA_MAX=2 && exec "$@"', str(limit)]
+
+        if self.profile.get('nice') and shutil.which('nice'):
+            prefix += ['nice', '-n', str(int(self.profile['nice']))]
+
+        io_class = self.profile.get('ionice_class')
+        if io_class in IONICE_CLASSES and shutil.which('ionice'):
+            prefix += ['ionice', '-c', str(IONICE_CLASSES[io_class])]
+            if io_class != 'idle' and 'ionice_level' in self.profile:
+                prefix += ['-n', str(int(self.profile['ionice_level']))]
+        return prefix + cmd
+
+    def kill(self, proc):
+        """Kill the run, including any processes it spawned"""
+        if self.cgroup is not None and (self.cgroup / 'cgroup.kill').exists():
+            try:
+                _write(self.cgroup / 'cgroup.kill', 1)
+                return
+            except OSError:
+                pass
+        proc.kill()
+
+    def release(self):
+        if self.cgroup is not None:
+            self._remove(self.cgroup)
+            self.cgroup = None
+
+    @staticmethod
+    def _remove(path):
+        # rmdir fails with EBUSY until the last process has been reaped
+        for _ in range(50):
+            try:
+                path.rmdir()
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                time.sleep(0.02)
+        print(f"Could not remove run cgroup {path}")
+
+
+def run_limited(cmd, profile=None, timeout=None, on_start=None):
+    """subprocess.run(cmd, capture_output=True, text=True) under a resource profile
+
+    on_start, if given, is called with a no-argument function that kills
+    the run (used by the queue worker when it loses a job's lease).
+    """
+    limits = RunLimits(profile)
+    try:
+        proc = subprocess.Popen(limits.command(cmd), stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True)
+        if on_start:
+            on_start(lambda: limits.kill(proc))
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            limits.kill(proc)
+            proc.communicate()
+            raise
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+    finally:
+        limits.release()
@@ -1,24 +1,36 @@
 #!/usr/bin/env python3
 """
 Data Backup Script
-Backs up files from source to destination with optional compression
+Backs up files from source to destination with optional compression,
+and verifies backups against their source by checksum
 """
 
 import argparse
+import hashlib
+import json
+import mmap
 import os
 import shutil
+import time
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+HASH_ALGORITHM = 'sha256'
+CHUNK_SIZE = 1024 * 1024
+# Files at least this large are hashed through mmap instead of read() copies
+MMAP_THRESHOLD = 4 * 1024 * 1024
+MANIFEST_SUFFIX = '.manifest.json'
+
 def backup_with_compression(source, destination):
-    """Create a compressed backup"""
+    """Create a compressed backup; returns the zip path, or None on error"""
     source_path = Path(source)
     dest_path = Path(destination)
 
     if not source_path.exists():
         print(f"Error: Source path '{source}' does not exist")
-        return False
+        return None
 
     # Create destination directory if it doesn't exist
     dest_path.mkdir(parents=True, exist_ok=True)
@@ -61,16 +73,16 @@ def backup_with_compression(source, destination):
     print(f"Compression ratio: {compression_ratio:.1f}%")
     print(f"Backup saved to: {zip_path}")
 
-    return True
+    return zip_path
 
 def backup_without_compression(source, destination):
-    """Create a regular backup without compression"""
+    """Create a regular backup without compression; returns the backup folder, or None on error"""
     source_path = Path(source)
     dest_path = Path(destination)
 
     if not source_path.exists():
         print(f"Error: Source path '{source}' does not exist")
-        return False
+        return None
 
     # Create backup folder with timestamp
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -104,24 +116,270 @@ def backup_without_compression(source, destination):
     print(f"Total size: {total_size / (1024*1024):.2f} MB")
     print(f"Backup saved to: {backup_folder}")
 
+    return backup_folder
+
+def hash_file(path):
+    """Hex digest of the file at path, or None if it cannot be read"""
+    digest = hashlib.new(HASH_ALGORITHM)
+    try:
+        with open(path, 'rb') as f:
+            mapped = None
+            if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                try:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    # e.g. ENOMEM: a file near the run's RLIMIT_AS cannot be mapped, so stream it
+                    mapped = None
+            if mapped is not None:
+                with mapped:
+                    if hasattr(mapped, 'madvise'):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    digest.update(mapped)
+            else:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+    except (OSError, ValueError):
+        return None
+    return digest.hexdigest()
+
+
+def hash_zip_members(zip_path, names):
+    """[(name, digest)] for the named members, streamed out of the archive
+
+    The digest is None for members that cannot be read or fail their CRC.
+    """
+    results = []
+    with zipfile.ZipFile(zip_path) as zipf:
+        for name in names:
+            digest = hashlib.new(HASH_ALGORITHM)
+            try:
+                with zipf.open(name) as member:
+                    for chunk in iter(lambda: member.read(CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                results.append((name, digest.hexdigest()))
+            except (zipfile.BadZipFile, OSError, EOFError) as e:
+                print(f"Error: cannot read '{name}' from {zip_path}: {e}")
+                results.append((name, None))
+    return results
+
+
+def hash_all(files, zip_path, members, workers):
+    """Hash files ({key: path}) and zip members (names) across workers processes
+
+    Returns ({key: digest}, {name: digest}).
+    """
+    file_keys = list(files)
+    paths = [str(files[key]) for key in file_keys]
+    # Round-robin over the members so every chunk gets a similar mix of sizes
+    chunks = [members[i::workers * 4] for i in range(workers * 4)] if members else []
+    chunks = [chunk for chunk in chunks if chunk]
+
+    if workers <= 1 or len(paths) + len(members) <= 1:
+        file_digests = [hash_file(path) for path in paths]
+        member_digests = [pair for chunk in chunks for pair in hash_zip_members(zip_path, chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            member_futures = [pool.submit(hash_zip_members, str(zip_path), chunk) for chunk in chunks]
+            chunksize = max(1, len(paths) // (workers * 4))
+            file_digests = list(pool.map(hash_file, paths, chunksize=chunksize))
+            member_digests = [pair for future in member_futures for pair in future.result()]
+
+    return dict(zip(file_keys, file_digests)), dict(member_digests)
+
+
+def scan_tree(root, relative_to):
+    """{key: (path, size, mtime_ns)} for the regular files at or under root"""
+    entries = {}
+    items = [root] if root.is_file() else root.rglob('*')
+    for item in items:
+        if item.is_file():
+            stat = item.stat()
+            key = item.name if item == root else item.relative_to(relative_to).as_posix()
+            entries[key] = (item, stat.st_size, stat.st_mtime_ns)
+    return entries
+
+
+def stale_entries(entries, cached):
+    """The entries whose size or mtime differ from the cached [size, mtime_ns, digest]"""
+    return {key: path for key, (path, size, mtime) in entries.items()
+            if cached.get(key, [None, None])[:2] != [size, mtime]}
+
+
+def load_manifest(manifest_path):
+    """Previous manifest, or {} if there is none or it cannot be used"""
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('algorithm') == HASH_ALGORITHM else {}
+
+
+def write_manifest(manifest_path, manifest):
+    """Write the manifest atomically so an interrupted verify leaves the old one intact"""
+    tmp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def default_workers():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def verify_backup(source, backup, workers=None):
+    """Compare checksums of source and backup (zip or folder); returns True if they all match
+
+    Checksums are kept in <backup>.manifest.json beside the backup; files
+    whose size and mtime match the manifest are not hashed again, and an
+    unchanged zip reuses all of its member checksums.
+    """
+    source_path = Path(source)
+    backup_path = Path(backup)
+    workers = workers or default_workers()
+
+    if not source_path.exists():
+        print(f"Error: Source path '{source}' does not exist")
+        return False
+    if not backup_path.exists():
+        print(f"Error: Backup '{backup}' does not exist")
+        return False
+
+    zipped = backup_path.is_file()
+    manifest_path = backup_path.with_name(backup_path.name + MANIFEST_SUFFIX)
+    manifest = load_manifest(manifest_path)
+
+    print(f"\nVerifying backup: {backup_path}")
+    print(f"Source: {source}\n")
+
+    # Zip members are stored relative to the source's parent, copies relative to the source
+    source_entries = scan_tree(source_path, source_path.parent if zipped else source_path)
+    cached_source = manifest.get('source', {})
+    source_todo = stale_entries(source_entries, cached_source)
+
+    cached_backup = manifest.get('backup', {})
+    if zipped:
+        stat = backup_path.stat()
+        archive = [stat.st_size, stat.st_mtime_ns]
+        try:
+            with zipfile.ZipFile(backup_path) as zipf:
+                infos = [info for info in zipf.infolist() if not info.is_dir()]
+        except zipfile.BadZipFile as e:
+            print(f"Error: '{backup}' is not a readable zip file: {e}")
+            return False
+        member_sizes = {info.filename: info.file_size for info in infos}
+        cached_members = cached_backup.get('files', {}) if cached_backup.get('archive') == archive else {}
+        backup_todo = {}
+        members_todo = sorted((name for name in member_sizes if name not in cached_members),
+                              key=lambda name: -member_sizes[name])
+    else:
+        backup_entries = scan_tree(backup_path, backup_path)
+        cached_files = cached_backup.get('files', {})
+        backup_todo = stale_entries(backup_entries, cached_files)
+        members_todo = []
+
+    files_todo = {('source', key): path for key, path in source_todo.items()}
+    files_todo.update({('backup', key): path for key, path in backup_todo.items()})
+
+    start = time.perf_counter()
+    file_digests, member_digests = hash_all(files_todo, backup_path, members_todo, workers)
+    elapsed = time.perf_counter() - start
+
+    source_digests = {key: cached_source[key][2] for key in source_entries if key not in source_todo}
+    source_digests.update({key: digest for (side, key), digest in file_digests.items() if side == 'source'})
+    if zipped:
+        backup_digests = {name: cached_members[name] for name in member_sizes if name in cached_members}
+        backup_digests.update(member_digests)
+    else:
+        backup_digests = {key: cached_files[key][2] for key in backup_entries if key not in backup_todo}
+        backup_digests.update({key: digest for (side, key), digest in file_digests.items() if side == 'backup'})
+
+    mismatches = []
+    for key in sorted(set(source_digests) | set(backup_digests)):
+        if key not in backup_digests:
+            mismatches.append((key, 'missing from backup'))
+        elif key not in source_digests:
+            mismatches.append((key, 'not in source'))
+        elif source_digests[key] is None or backup_digests[key] is None:
+            mismatches.append((key, 'unreadable'))
+        elif source_digests[key] != backup_digests[key]:
+            mismatches.append((key, 'contents differ'))
+
+    # Unreadable files are left out so the next verify hashes them again
+    manifest = {
+        'algorithm': HASH_ALGORITHM,
+        'verified_at': datetime.now().isoformat(timespec='seconds'),
+        'source': {key: [size, mtime, source_digests[key]]
+                   for key, (_, size, mtime) in source_entries.items() if source_digests.get(key)},
+    }
+    if zipped:
+        manifest['backup'] = {'archive': archive,
+                              'files': {name: digest for name, digest in backup_digests.items() if digest}}
+    else:
+        manifest['backup'] = {'files': {key: [size, mtime, backup_digests[key]]
+                                        for key, (_, size, mtime) in backup_entries.items()
+                                        if backup_digests.get(key)}}
+    try:
+        write_manifest(manifest_path, manifest)
+    except OSError as e:
+        print(f"Warning: could not write manifest {manifest_path}: {e}")
+
+    # Only files that were actually hashed count towards the rate; unreadable ones take no time
+    hashed_sizes = [source_entries[key][1] if side == 'source' else backup_entries[key][1]
+                    for (side, key), digest in file_digests.items() if digest]
+    hashed_sizes += [member_sizes[name] for name, digest in member_digests.items() if digest]
+    attempted = len(files_todo) + len(members_todo)
+    hashed = len(hashed_sizes)
+    reused = len(source_digests) + len(backup_digests) - attempted
+    mb = sum(hashed_sizes) / (1024 * 1024)
+    rate = mb / elapsed if elapsed > 0 else 0.0
+    print(f"Hashed {hashed} files ({mb:.2f} MB) in {elapsed:.2f}s: {rate:.1f} MB/s with {workers} process(es)")
+    if attempted > hashed:
+        print(f"Could not read {attempted - hashed} files")
+    print(f"Reused {reused} unchanged checksums from {manifest_path.name}")
+
+    if mismatches:
+        for key, reason in mismatches:
+            print(f"✗ Mismatch: {key} ({reason})")
+        print(f"\n✗ Verification failed: {len(mismatches)} of {len(source_digests | backup_digests)} files do not match")
+        return False
+
+    print(f"\n✓ Backup verified: {len(source_digests)} files match")
     return True
 
 def main():
     parser = argparse.ArgumentParser(description='Backup files to a destination')
     parser.add_argument('--source', required=True, help='Source path to backup')
-    parser.add_argument('--destination', required=True, help='Destination path for backup')
+    parser.add_argument('--destination', help='Destination path for backup')
     parser.add_argument('--compress', action='store_true', help='Compress the backup')
+    parser.add_argument('--verify', action='store_true',
+                        help='Compare checksums of the source and the new backup afterwards')
+    parser.add_argument('--check', metavar='BACKUP',
+                        help='Verify an existing backup (zip or folder) against --source instead of creating one')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help='Processes used for hashing during verification')
 
     args = parser.parse_args()
 
+    if args.check:
+        return 0 if verify_backup(args.source, args.check, args.workers) else 1
+
+    if not args.destination:
+        parser.error('--destination is required unless --check is given')
+
     print("Starting backup process...\n")
 
     if args.compress:
-        success = backup_with_compression(args.source, args.destination)
+        backup = backup_with_compression(args.source, args.destination)
     else:
-        success = backup_without_compression(args.source, args.destination)
+        backup = backup_without_compression(args.source, args.destination)
+
+    if backup and args.verify:
+        return 0 if verify_backup(args.source, backup, args.workers) else 1
 
-    return 0 if success else 1
+    return 0 if backup else 1
 
 if __name__ == '__main__':
     exit(main())
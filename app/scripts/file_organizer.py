@@ -1,137 +1,294 @@
 import argparse
+import ctypes
+import ctypes.util
 import os
+import select
 import shutil
+import signal
+import struct
+import time
 from pathlib import Path
 from datetime import datetime
 
-def organize_by_extension(source_folder):
-    """Organize files by their extension"""
-    source = Path(source_folder)
+# Size categories in bytes
+SIZE_CATEGORIES = [
+    (1024 * 1024, 'small'),           # < 1MB
+    (10 * 1024 * 1024, 'medium'),     # < 10MB
+    (100 * 1024 * 1024, 'large'),     # < 100MB
+    (float('inf'), 'very_large')       # >= 100MB
+]
 
-    if not source.exists():
-        print(f"Error: Source folder '{source_folder}' does not exist")
-        return False
+# inotify constants (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
 
-    files_moved = 0
+EVENT_HEADER = struct.Struct('iIII')
 
-    for item in source.iterdir():
-        if item.is_file():
-            # Get file extension (without the dot)
-            ext = item.suffix[1:] if item.suffix else 'no_extension'
 
-            # Create folder for this extension
-            dest_folder = source / ext
-            dest_folder.mkdir(exist_ok=True)
+def extension_folder(item, stat):
+    """Folder named after the file extension (without the dot)"""
+    return item.suffix[1:] if item.suffix else 'no_extension'
 
-            # Move file
-            dest_path = dest_folder / item.name
 
-            # Handle duplicates
-            counter = 1
-            while dest_path.exists():
-                name_without_ext = item.stem
-                dest_path = dest_folder / f"{name_without_ext}_{counter}{item.suffix}"
-                counter += 1
+def date_folder(item, stat):
+    """Folder named after the modification month"""
+    return datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m')
 
-            shutil.move(str(item), str(dest_path))
-            files_moved += 1
-            print(f"Moved: {item.name} -> {ext}/")
 
-    print(f"\n✓ Successfully organized {files_moved} files by extension")
-    return True
+def size_folder(item, stat):
+    """Folder named after the size category"""
+    for size_limit, category in SIZE_CATEGORIES:
+        if stat.st_size < size_limit:
+            return category
+    return 'very_large'
 
-def organize_by_date(source_folder):
-    """Organize files by modification date"""
+
+DESTINATIONS = {
+    'extension': extension_folder,
+    'date': date_folder,
+    'size': size_folder,
+}
+
+
+def move_file(source, item, folder):
+    """Move item into source/folder, renaming on name clashes; returns the new path"""
+    dest_folder = source / folder
+    dest_folder.mkdir(exist_ok=True)
+
+    dest_path = dest_folder / item.name
+
+    # Handle duplicates
+    counter = 1
+    while dest_path.exists():
+        dest_path = dest_folder / f"{item.stem}_{counter}{item.suffix}"
+        counter += 1
+
+    shutil.move(str(item), str(dest_path))
+    print(f"Moved: {item.name} -> {folder}/")
+    return dest_path
+
+
+def organize(source_folder, method):
+    """One pass over the files directly in source_folder"""
     source = Path(source_folder)
 
     if not source.exists():
         print(f"Error: Source folder '{source_folder}' does not exist")
         return False
 
+    destination = DESTINATIONS[method]
     files_moved = 0
 
     for item in source.iterdir():
         if item.is_file():
-            # Get modification date
-            mod_time = datetime.fromtimestamp(item.stat().st_mtime)
-            year_month = mod_time.strftime('%Y-%m')
+            move_file(source, item, destination(item, item.stat()))
+            files_moved += 1
 
-            # Create folder for this date
-            dest_folder = source / year_month
-            dest_folder.mkdir(exist_ok=True)
+    print(f"\n✓ Successfully organized {files_moved} files by {method}")
+    return True
 
-            # Move file
-            dest_path = dest_folder / item.name
 
-            # Handle duplicates
-            counter = 1
-            while dest_path.exists():
-                name_without_ext = item.stem
-                dest_path = dest_folder / f"{name_without_ext}_{counter}{item.suffix}"
-                counter += 1
+def organize_by_extension(source_folder):
+    """Organize files by their extension"""
+    return organize(source_folder, 'extension')
 
-            shutil.move(str(item), str(dest_path))
-            files_moved += 1
-            print(f"Moved: {item.name} -> {year_month}/")
 
-    print(f"\n✓ Successfully organized {files_moved} files by date")
-    return True
+def organize_by_date(source_folder):
+    """Organize files by modification date"""
+    return organize(source_folder, 'date')
+
 
 def organize_by_size(source_folder):
     """Organize files by size categories"""
+    return organize(source_folder, 'size')
+
+
+class Inotify:
+    """Minimal ctypes binding for a non-recursive inotify watch"""
+
+    def __init__(self, path, mask):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify is not available on this system')
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def read(self, timeout, wake_fd=None):
+        """Events as (mask, name) pairs; waits at most timeout seconds (None = forever)
+
+        Data on wake_fd (a signal wakeup pipe) ends the wait early, since
+        select() is restarted after a signal handler returns.
+        """
+        fds = [self.fd] if wake_fd is None else [self.fd, wake_fd]
+        ready, _, _ = select.select(fds, [], [], timeout)
+        if wake_fd in ready:
+            try:
+                while os.read(wake_fd, 512):
+                    pass
+            except BlockingIOError:
+                pass
+        if self.fd not in ready:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def file_signature(path):
+    """(size, mtime) of path, or None if it is gone"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def watch(source_folder, method, settle=2.0):
+    """Organize files as they land in source_folder until SIGINT/SIGTERM
+
+    Only closed-after-write and moved-in files are looked at, so the cost
+    is per new file, not per folder size. A file is moved once it has had
+    no new events for `settle` seconds and its size and mtime are stable,
+    which lets writers that reopen or append finish first.
+    """
     source = Path(source_folder)
 
-    if not source.exists():
+    if not source.is_dir():
         print(f"Error: Source folder '{source_folder}' does not exist")
         return False
 
-    files_moved = 0
+    destination = DESTINATIONS[method]
+    try:
+        inotify = Inotify(source, IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF)
+    except OSError as e:
+        print(f"Error: cannot watch '{source_folder}': {e}")
+        return False
 
-    # Size categories in bytes
-    size_categories = [
-        (1024 * 1024, 'small'),           # < 1MB
-        (10 * 1024 * 1024, 'medium'),     # < 10MB
-        (100 * 1024 * 1024, 'large'),     # < 100MB
-        (float('inf'), 'very_large')       # >= 100MB
-    ]
+    stopping = []
 
-    for item in source.iterdir():
-        if item.is_file():
-            file_size = item.stat().st_size
-
-            # Determine size category
-            category = 'very_large'
-            for size_limit, cat_name in size_categories:
-                if file_size < size_limit:
-                    category = cat_name
-                    break
-
-            # Create folder for this category
-            dest_folder = source / category
-            dest_folder.mkdir(exist_ok=True)
-
-            # Move file
-            dest_path = dest_folder / item.name
-
-            # Handle duplicates
-            counter = 1
-            while dest_path.exists():
-                name_without_ext = item.stem
-                dest_path = dest_folder / f"{name_without_ext}_{counter}{item.suffix}"
-                counter += 1
-
-            shutil.move(str(item), str(dest_path))
-            files_moved += 1
-            print(f"Moved: {item.name} -> {category}/")
+    def stop(signum, frame):
+        stopping.append(signum)
 
-    print(f"\n✓ Successfully organized {files_moved} files by size")
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # Files already there when the watch starts
+    organize(source, method)
+    print(f"\nWatching {source} (by {method}, settle {settle}s). Stop with Ctrl+C.")
+
+    # name -> (deadline, (size, mtime) when last seen)
+    pending = {}
+    files_moved = 0
+
+    # The signal number is also written here, waking the select() below
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    previous_wakeup = signal.set_wakeup_fd(wake_w)
+
+    try:
+        while not stopping:
+            now = time.monotonic()
+            timeout = max(0.0, min(d for d, _ in pending.values()) - now) if pending else None
+            try:
+                events = inotify.read(timeout, wake_r)
+            except InterruptedError:
+                continue
+
+            for mask, name in events:
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    print(f"Error: watched folder '{source_folder}' was removed or moved")
+                    return False
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped: fall back to one full pass
+                    print("Event queue overflowed, rescanning")
+                    for item in source.iterdir():
+                        if item.is_file():
+                            pending[item.name] = (time.monotonic() + settle, file_signature(item))
+                    continue
+                if name and not mask & IN_ISDIR:
+                    pending[name] = (time.monotonic() + settle, file_signature(source / name))
+
+            now = time.monotonic()
+            for name, (deadline, last_seen) in list(pending.items()):
+                if deadline > now:
+                    continue
+
+                item = source / name
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    # Temporary file renamed away, or removed again
+                    del pending[name]
+                    continue
+
+                if not item.is_file():
+                    del pending[name]
+                    continue
+
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if signature != last_seen:
+                    # Still being written: check again after another settle period
+                    pending[name] = (now + settle, signature)
+                    continue
+
+                del pending[name]
+                try:
+                    move_file(source, item, destination(item, stat))
+                except OSError as e:
+                    # Removed, renamed or locked in the meantime: skip it, keep watching
+                    print(f"Error: could not move {name}: {e}")
+                    continue
+                files_moved += 1
+    finally:
+        signal.set_wakeup_fd(previous_wakeup)
+        os.close(wake_r)
+        os.close(wake_w)
+        inotify.close()
+
+    print(f"\n✓ Watch stopped; organized {files_moved} new files by {method}")
     return True
 
+
 def main():
     parser = argparse.ArgumentParser(description='Organize files in a directory')
     parser.add_argument('--source_folder', required=True, help='Source folder to organize')
     parser.add_argument('--organize_by', required=True, choices=['extension', 'date', 'size'],
                        help='Organization method')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and organize new files as they arrive (Linux inotify)')
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help='Seconds a new file must stay unchanged before it is moved (watch mode)')
 
     args = parser.parse_args()
 
@@ -139,12 +296,10 @@ def main():
     print(f"Source: {args.source_folder}")
     print(f"Method: {args.organize_by}\n")
 
-    if args.organize_by == 'extension':
-        success = organize_by_extension(args.source_folder)
-    elif args.organize_by == 'date':
-        success = organize_by_date(args.source_folder)
+    if args.watch:
+        success = watch(args.source_folder, args.organize_by, args.settle)
     else:
-        success = organize_by_size(args.source_folder)
+        success = organize(args.source_folder, args.organize_by)
 
     if success:
         print("\n✓ File organization completed successfully!")
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+User Offboarding Script
+Removes a departing user's account from every configured security tool.
+
+Connectors are listed in config/offboarding_connectors.json (or the file
+named by $OFFBOARDING_CONNECTORS) and all run in parallel, so the total
+time is that of the slowest system rather than the sum. Each connector
+first looks the account up, then deprovisions it:
+
+- every attempt has its own timeout, and connection errors, timeouts,
+  429 and 5xx responses are retried with exponential backoff;
+- the lookup result must match the email exactly; more than one match
+  fails the system rather than removing whichever account came first;
+- an account that is already gone counts as done, and every request
+  carries an Idempotency-Key (one per operation, stable across runs),
+  so re-running an offboarding is safe;
+- without --fanged nothing is changed: lookups run and the report says
+  what would be removed.
+
+Connector types are "http" (a configurable REST call pair) or
+"module:ClassName" for a custom Connector subclass.
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config' / 'offboarding_connectors.json'
+
+DEFAULTS = {'timeout': 10, 'retries': 2, 'backoff': 0.5}
+MAX_RETRY_AFTER = 30
+
+# Connector threads only wait on HTTP, so they get small stacks and are
+# capped: without a delegated cgroup memory_max is an RLIMIT_AS, which
+# counts each thread's reserved stack and malloc arena
+MAX_WORKERS = 16
+THREAD_STACK_SIZE = 512 * 1024
+
+
+class ConnectorError(Exception):
+    """A connector call failed; retryable errors are attempted again"""
+
+    def __init__(self, message, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class Connector:
+    """One security tool the user has to be removed from"""
+
+    def __init__(self, config, defaults):
+        settings = dict(defaults, **config)
+        self.config = config
+        self.name = config['name']
+        self.timeout = float(settings['timeout'])
+        self.retries = int(settings['retries'])
+        self.backoff = float(settings['backoff'])
+
+    def lookup(self, email, idempotency_key):
+        """Account id for email, or None if the user has no account here"""
+        raise NotImplementedError
+
+    def deprovision(self, email, account_id, idempotency_key):
+        """Remove or disable the account; False if it was already gone"""
+        raise NotImplementedError
+
+
+def field_values(item, path):
+    """Values at a dotted path in parsed JSON; lists on the way are searched element-wise"""
+    values = [item]
+    for part in path.split('.'):
+        values = [v[part] for value in values
+                  for v in (value if isinstance(value, list) else [value])
+                  if isinstance(v, dict) and part in v]
+    return [v for value in values for v in (value if isinstance(value, list) else [value])]
+
+
+class HTTPConnector(Connector):
+    """REST connector: a lookup request, then a deprovision request
+
+    Paths may use {email} and {id}. The lookup either fetches one account
+    or searches; for a search, results_field names the list of matches
+    (e.g. "Resources" for SCIM). Only results whose match_field (default
+    "email", dotted paths allowed) equals the email count, and the id is
+    read from id_field (default "id"). match_field null trusts the
+    endpoint's own exact filter, for APIs that return bare ids.
+
+    A 404 is an error unless absent_on_404 is set, since a wrong path
+    would otherwise report every account as already removed.
+    """
+
+    def __init__(self, config, defaults):
+        super().__init__(config, defaults)
+        self.base_url = config['base_url'].rstrip('/')
+        self.lookup_call = config.get('lookup', {'method': 'GET', 'path': '/users/{email}'})
+        self.deprovision_call = config.get('deprovision', {'method': 'DELETE', 'path': '/users/{id}'})
+        self.id_field = config.get('id_field', 'id')
+        self.results_field = config.get('results_field')
+        self.match_field = config.get('match_field', 'email')
+        self.absent_on_404 = bool(config.get('absent_on_404', False))
+
+        self.headers = {'Accept': 'application/json'}
+        self.headers.update(config.get('headers', {}))
+        token_env = config.get('token_env')
+        if token_env:
+            token = os.getenv(token_env)
+            if not token:
+                raise ValueError(f"environment variable {token_env} is not set")
+            self.headers['Authorization'] = f"{config.get('auth_scheme', 'Bearer')} {token}"
+
+    def _request(self, call, idempotency_key, **values):
+        path = call['path'].format(**{k: urllib.parse.quote(str(v), safe='') for k, v in values.items()})
+        body = call.get('body')
+        data = json.dumps(body).encode() if body is not None else None
+
+        request = urllib.request.Request(self.base_url + path, data=data, method=call['method'])
+        for key, value in self.headers.items():
+            request.add_header(key, value)
+        request.add_header('Idempotency-Key', idempotency_key)
+        if data is not None:
+            request.add_header('Content-Type', 'application/json')
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = response.read()
+                return response.status, json.loads(payload) if payload.strip() else {}
+        except urllib.error.HTTPError as e:
+            if e.code == 404 and self.absent_on_404:
+                return 404, None
+            retryable = e.code == 429 or e.code >= 500
+            retry_after = e.headers.get('Retry-After')
+            hint = ' (set absent_on_404 if this means the account is gone)' if e.code == 404 else ''
+            raise ConnectorError(f"HTTP {e.code} from {call['method']} {path}{hint}", retryable,
+                                 float(retry_after) if retry_after and retry_after.isdigit() else None)
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            reason = getattr(e, 'reason', e)
+            raise ConnectorError(f"{call['method']} {path}: {reason}", retryable=True)
+
+    def lookup(self, email, idempotency_key):
+        status, payload = self._request(self.lookup_call, idempotency_key, email=email)
+        if status == 404:
+            return None
+
+        search = self.results_field is not None or isinstance(payload, list)
+        if self.results_field is not None:
+            candidates = field_values(payload, self.results_field)
+        elif isinstance(payload, list):
+            candidates = payload
+        else:
+            candidates = [payload] if payload else []
+
+        if self.match_field is None:
+            matches = candidates
+        else:
+            matches = [c for c in candidates
+                       if email.lower() in (str(v).lower() for v in field_values(c, self.match_field))]
+
+        if not matches:
+            if candidates and not search:
+                # A direct fetch returned somebody else: the path is wrong
+                raise ConnectorError(f"Lookup returned an account whose {self.match_field} is not {email}")
+            return None
+        if len(matches) > 1:
+            raise ConnectorError(f"{len(matches)} accounts match {email}; not choosing one")
+
+        match = matches[0]
+        if not isinstance(match, dict):
+            return match
+        ids = field_values(match, self.id_field)
+        if not ids:
+            raise ConnectorError(f"Lookup result has no '{self.id_field}' field")
+        return ids[0]
+
+    def deprovision(self, email, account_id, idempotency_key):
+        status, _ = self._request(self.deprovision_call, idempotency_key, email=email, id=account_id)
+        return status != 404
+
+
+CONNECTOR_TYPES = {
+    'http': HTTPConnector,
+}
+
+
+def load_connectors(config_path):
+    """Instantiate every enabled connector; returns (connectors, config errors)"""
+    with open(config_path) as f:
+        config = json.load(f)
+
+    defaults = dict(DEFAULTS, **config.get('defaults', {}))
+    connectors, errors = [], []
+
+    for entry in config.get('connectors', []):
+        if not entry.get('enabled', True):
+            continue
+        try:
+            kind = entry.get('type', 'http')
+            if kind in CONNECTOR_TYPES:
+                cls = CONNECTOR_TYPES[kind]
+            else:
+                module_name, class_name = kind.split(':')
+                cls = getattr(importlib.import_module(module_name), class_name)
+            connectors.append(cls(entry, defaults))
+        except Exception as e:
+            errors.append({'system': entry.get('name', '?'), 'status': 'failed', 'requests': 0,
+                           'latency_ms': 0.0, 'message': f"Configuration error: {e}"})
+
+    return connectors, errors
+
+
+def with_retries(connector, fn, *args):
+    """Call fn, retrying retryable ConnectorErrors; returns (result, attempts)"""
+    for attempt in range(connector.retries + 1):
+        try:
+            return fn(*args), attempt + 1
+        except ConnectorError as e:
+            if not e.retryable or attempt == connector.retries:
+                e.attempts = attempt + 1
+                raise
+            delay = e.retry_after if e.retry_after is not None else connector.backoff * 2 ** attempt
+            time.sleep(min(delay, MAX_RETRY_AFTER) * random.uniform(0.8, 1.2))
+
+
+def idempotency_key(connector, email, operation, account_id=''):
+    """Key for one operation, the same on every run
+
+    APIs tie a key to a single request, so the lookup and the deprovision
+    each get their own; a repeated offboarding reuses both.
+    """
+    material = f"offboard:{connector.name}:{email.lower()}:{operation}:{account_id}"
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def offboard_one(connector, email, fanged):
+    """Run one connector end to end; returns a result dict, never raises"""
+    start = time.perf_counter()
+    attempts = 0
+
+    try:
+        account_id, attempts = with_retries(connector, connector.lookup, email,
+                                            idempotency_key(connector, email, 'lookup'))
+        if account_id is None:
+            status, message = 'absent', 'No account (already removed)'
+        elif not fanged:
+            status, message = 'dry_run', f"Would remove account {account_id}"
+        else:
+            removed, more = with_retries(connector, connector.deprovision, email, account_id,
+                                         idempotency_key(connector, email, 'deprovision', account_id))
+            attempts += more
+            if removed:
+                status, message = 'removed', f"Removed account {account_id}"
+            else:
+                status, message = 'absent', f"Account {account_id} was already removed"
+    except ConnectorError as e:
+        attempts += getattr(e, 'attempts', 1)
+        status, message = 'failed', str(e)
+    except Exception as e:
+        attempts = max(attempts, 1)
+        status, message = 'failed', f"{type(e).__name__}: {e}"
+
+    return {
+        'system': connector.name,
+        'status': status,
+        'requests': attempts,
+        'latency_ms': round((time.perf_counter() - start) * 1000, 1),
+        'message': message,
+    }
+
+
+def offboard(email, fanged, config_path):
+    """Offboard email from every connector in parallel; returns (results, elapsed seconds)"""
+    start = time.perf_counter()
+    connectors, results = load_connectors(config_path)
+
+    if connectors:
+        threading.stack_size(THREAD_STACK_SIZE)
+        workers = min(len(connectors), MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='offboard') as pool:
+            results += list(pool.map(lambda c: offboard_one(c, email, fanged), connectors))
+
+    return results, time.perf_counter() - start
+
+
+def print_report(email, fanged, results, elapsed):
+    print("=" * 60)
+    print(f"USER OFFBOARDING{'' if fanged else ' (DRY RUN)'}")
+    print("=" * 60)
+    print(f"\nUser: {email}")
+    print(f"Systems: {len(results)}\n")
+
+    if not results:
+        print("No offboarding connectors are enabled.")
+        print("Configure them in config/offboarding_connectors.json")
+        return
+
+    print(f"{'System':<20} {'Status':<9} {'Reqs':>5} {'Latency':>10}  Details")
+    for result in sorted(results, key=lambda r: r['system']):
+        print(f"{result['system']:<20} {result['status']:<9} {result['requests']:>5} "
+              f"{result['latency_ms']:>8.1f}ms  {result['message']}")
+
+    failed = [r for r in results if r['status'] == 'failed']
+    slowest = max(results, key=lambda r: r['latency_ms'])
+    serial = sum(r['latency_ms'] for r in results) / 1000
+
+    print(f"\nTotal time: {elapsed:.2f}s (slowest: {slowest['system']} {slowest['latency_ms'] / 1000:.2f}s, "
+          f"sequential would be ~{serial:.2f}s)")
+    if failed:
+        print(f"✗ Offboarding incomplete: {len(failed)} of {len(results)} systems failed")
+    elif fanged:
+        print(f"✓ Offboarding completed: {len(results)} systems")
+    else:
+        print(f"✓ Dry run completed: {len(results)} systems checked, nothing changed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Remove a user from all security tools')
+    parser.add_argument('--email', required=True, help='Email of the departing user')
+    parser.add_argument('--fanged', action='store_true',
+                        help='Actually deprovision (default is a dry run)')
+    parser.add_argument('--config', default=os.getenv('OFFBOARDING_CONNECTORS', str(CONFIG_PATH)),
+                        help='Connector configuration file')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        results, elapsed = offboard(args.email.strip(), args.fanged, args.config)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not load connector configuration: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps({'email': args.email, 'fanged': args.fanged,
+                          'elapsed_s': round(elapsed, 3), 'results': results}, indent=2))
+    else:
+        print_report(args.email, args.fanged, results, elapsed)
+
+    return 1 if any(r['status'] == 'failed' for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,317 @@
+"""
+Server-Side Session Store
+
+Replaces Flask's signed-cookie session with a small signed opaque id
+cookie; the session data lives server-side in SQLite or MySQL, with a
+short-lived in-process LRU in front so most requests never reach the
+backend. A background thread purges expired sessions, and
+revoke_user_sessions() logs a user out everywhere.
+
+Enabled with SESSION_BACKEND=sqlite|mysql (see factory.create_app).
+"""
+
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.sessions import SessionInterface, SessionMixin, session_json_serializer
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+SESSION_LIFETIME = int(os.getenv('SESSION_LIFETIME', 12 * 3600))
+SESSION_CACHE_SIZE = int(os.getenv('SESSION_CACHE_SIZE', 1024))
+SESSION_CACHE_TTL = float(os.getenv('SESSION_CACHE_TTL', 5))
+SESSION_PURGE_INTERVAL = int(os.getenv('SESSION_PURGE_INTERVAL', 300))
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, expires_at=0):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.expires_at = expires_at
+        self.previous_sid = None
+
+    def regenerate(self):
+        """Move the session to a fresh id (call on login to prevent fixation)"""
+        if self.previous_sid is None and not self.new:
+            self.previous_sid = self.sid
+        self.sid = new_session_id()
+        self.modified = True
+
+    def clear(self):
+        # A cleared session (logout) never reuses the old id
+        super().clear()
+        self.regenerate()
+
+
+def new_session_id():
+    return secrets.token_urlsafe(32)
+
+
+def session_user_id(data):
+    """User id a session belongs to, for central revocation"""
+    user = data.get('user')
+    if isinstance(user, dict) and user.get('id') is not None:
+        return str(user['id'])
+    return data.get('_user_id')
+
+
+# ============================================
+# Backends
+# ============================================
+
+class SQLiteSessionStore:
+    """Sessions in a local SQLite file; fine for a single host"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id VARCHAR(64) PRIMARY KEY, user_id VARCHAR(64), "
+                "data TEXT NOT NULL, expires_at INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_user_id ON sessions (user_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def load(self, sid):
+        row = self._conn().execute(
+            "SELECT data, expires_at FROM sessions WHERE id = ?", (sid,)).fetchone()
+        return (session_json_serializer.loads(row[0]), row[1]) if row else None
+
+    def save(self, sid, data, user_id, expires_at):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, user_id, data, expires_at) VALUES (?, ?, ?, ?)",
+                (sid, user_id, session_json_serializer.dumps(data), int(expires_at))
+            )
+
+    def delete(self, sid):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (sid,))
+
+    def delete_user(self, user_id):
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM sessions WHERE user_id = ?", (str(user_id),)).rowcount
+
+    def purge_expired(self):
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM sessions WHERE expires_at < ?", (int(time.time()),)).rowcount
+
+
+class MySQLSessionStore:
+    """Sessions in the app's MySQL database (sessions table, see database_setup.sql)"""
+
+    def __init__(self, get_db):
+        self.get_db = get_db
+
+    def _execute(self, query, params, fetch=False):
+        db = self.get_db()
+        if not db:
+            raise RuntimeError('Session database unavailable')
+        try:
+            cursor = db.cursor()
+            cursor.execute(query, params)
+            if fetch:
+                return cursor.fetchone()
+            db.commit()
+            return cursor.rowcount
+        finally:
+            db.close()
+
+    def load(self, sid):
+        row = self._execute("SELECT data, expires_at FROM sessions WHERE id = %s", (sid,), fetch=True)
+        return (session_json_serializer.loads(row[0]), row[1]) if row else None
+
+    def save(self, sid, data, user_id, expires_at):
+        self._execute(
+            "INSERT INTO sessions (id, user_id, data, expires_at) VALUES (%s, %s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE user_id = VALUES(user_id), data = VALUES(data), expires_at = VALUES(expires_at)",
+            (sid, user_id, session_json_serializer.dumps(data), int(expires_at))
+        )
+
+    def delete(self, sid):
+        self._execute("DELETE FROM sessions WHERE id = %s", (sid,))
+
+    def delete_user(self, user_id):
+        return self._execute("DELETE FROM sessions WHERE user_id = %s", (str(user_id),))
+
+    def purge_expired(self):
+        return self._execute("DELETE FROM sessions WHERE expires_at < %s", (int(time.time()),))
+
+
+class CachedSessionStore:
+    """In-process LRU in front of a backend.
+
+    Entries are trusted for SESSION_CACHE_TTL seconds, which bounds how
+    long another worker can keep serving a session that was changed or
+    revoked elsewhere.
+    """
+
+    def __init__(self, backend, maxsize=SESSION_CACHE_SIZE, ttl=SESSION_CACHE_TTL):
+        self.backend = backend
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _put(self, sid, record):
+        with self._lock:
+            self._cache[sid] = (time.monotonic(), record)
+            self._cache.move_to_end(sid)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def _forget(self, sid):
+        with self._lock:
+            self._cache.pop(sid, None)
+
+    def load(self, sid):
+        with self._lock:
+            cached = self._cache.get(sid)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                self._cache.move_to_end(sid)
+                return cached[1]
+        record = self.backend.load(sid)
+        if record:
+            self._put(sid, record)
+        return record
+
+    def save(self, sid, data, user_id, expires_at):
+        self.backend.save(sid, data, user_id, expires_at)
+        self._put(sid, (dict(data), expires_at))
+
+    def delete(self, sid):
+        self._forget(sid)
+        self.backend.delete(sid)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            for sid in [s for s, (_, (data, _)) in self._cache.items()
+                        if session_user_id(data) == str(user_id)]:
+                del self._cache[sid]
+        return self.backend.delete_user(user_id)
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            for sid in [s for s, (_, (_, expires_at)) in self._cache.items() if expires_at < now]:
+                del self._cache[sid]
+        return self.backend.purge_expired()
+
+
+# ============================================
+# Flask integration
+# ============================================
+
+class ServerSideSessionInterface(SessionInterface):
+    serializer = session_json_serializer
+
+    def __init__(self, store, lifetime=SESSION_LIFETIME, purge_interval=SESSION_PURGE_INTERVAL):
+        self.store = store
+        self.lifetime = lifetime
+        self._start_purger(purge_interval)
+
+    def _start_purger(self, interval):
+        def purge_loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.store.purge_expired()
+                except Exception as e:
+                    print(f"Session purge failed: {e}")
+
+        threading.Thread(target=purge_loop, name='session-purger', daemon=True).start()
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-side-session')
+
+    def open_session(self, app, request):
+        signed_sid = request.cookies.get(self.get_cookie_name(app))
+        if signed_sid:
+            try:
+                sid = self._signer(app).unsign(signed_sid).decode()
+                record = self.store.load(sid)
+            except BadSignature:
+                record = None
+            except Exception as e:
+                print(f"Session load failed: {e}")
+                record = None
+
+            if record and record[1] > time.time():
+                return ServerSideSession(record[0], sid=sid, expires_at=record[1])
+
+        return ServerSideSession(sid=new_session_id(), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if session.previous_sid:
+            self.store.delete(session.previous_sid)
+
+        if not session:
+            if not session.new or session.previous_sid:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        # Unmodified sessions are only re-written to slide the expiry forward
+        if session.modified or session.new or session.expires_at - now < self.lifetime / 2:
+            session.expires_at = now + self.lifetime
+            self.store.save(session.sid, dict(session), session_user_id(session), session.expires_at)
+
+        if session.new or session.previous_sid:
+            response.set_cookie(
+                name,
+                self._signer(app).sign(session.sid.encode()).decode(),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+def init_session_store(app, backend):
+    """Install server-side sessions on app; backend is 'sqlite' or 'mysql'"""
+    if backend == 'sqlite':
+        path = os.getenv('SESSION_SQLITE_PATH', os.path.join(app.root_path, 'sessions.sqlite3'))
+        store = SQLiteSessionStore(path)
+    elif backend == 'mysql':
+        from core import get_db
+        store = MySQLSessionStore(get_db)
+    else:
+        raise ValueError(f"Unknown session backend '{backend}' (choose from: cookie, sqlite, mysql)")
+
+    app.session_interface = ServerSideSessionInterface(CachedSessionStore(store))
+    return app.session_interface
+
+
+def revoke_user_sessions(app, user_id):
+    """Delete every stored session of a user; returns the number removed"""
+    return app.session_interface.store.delete_user(user_id)
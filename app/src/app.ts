@@ -32,6 +32,7 @@ class AutomationUI {
     private async loadAutomations(): Promise<void> {
         try {
             const response = await fetch('/api/automations');
+            if (this.redirectIfLoggedOut(response)) return;
             if (!response.ok) throw new Error('Failed to load automations');
 
             this.automations = await response.json();
@@ -58,6 +59,7 @@ class AutomationUI {
     private setupEventListeners(): void {
         const selector = document.getElementById('automation-selector') as HTMLSelectElement;
         const runButton = document.getElementById('run-button') as HTMLButtonElement;
+        const bulkMode = document.getElementById('bulk-mode') as HTMLInputElement;
 
         selector?.addEventListener('change', (e) => {
             const target = e.target as HTMLSelectElement;
@@ -67,6 +69,12 @@ class AutomationUI {
         runButton?.addEventListener('click', () => {
             this.runAutomation();
         });
+
+        bulkMode?.addEventListener('change', () => {
+            const bulkGroup = document.getElementById('bulk-input-group');
+            if (bulkGroup) bulkGroup.style.display = bulkMode.checked ? 'block' : 'none';
+            runButton.textContent = this.runButtonLabel();
+        });
     }
 
     private onAutomationSelected(automationId: string): void {
@@ -155,6 +163,12 @@ class AutomationUI {
 
             container.appendChild(formGroup);
         });
+
+        // Show the expected CSV header for bulk runs
+        const bulkInput = document.getElementById('bulk-input') as HTMLTextAreaElement | null;
+        if (bulkInput) {
+            bulkInput.placeholder = this.selectedAutomation.parameters.map(p => p.name).join(',') + '\n...';
+        }
     }
 
     private clearAutomationDetails(): void {
@@ -213,9 +227,158 @@ class AutomationUI {
         return isValid;
     }
 
+    private isBulkMode(): boolean {
+        const bulkMode = document.getElementById('bulk-mode') as HTMLInputElement | null;
+        return !!bulkMode?.checked;
+    }
+
+    private runButtonLabel(): string {
+        return this.isBulkMode() ? 'Run Batch' : 'Run Automation';
+    }
+
+    private parseCsv(text: string): string[][] {
+        const rows: string[][] = [];
+        let row: string[] = [];
+        let field = '';
+        let quoted = false;
+
+        for (let i = 0; i < text.length; i++) {
+            const c = text[i];
+            if (quoted) {
+                if (c === '"' && text[i + 1] === '"') {
+                    field += '"';
+                    i++;
+                } else if (c === '"') {
+                    quoted = false;
+                } else {
+                    field += c;
+                }
+            } else if (c === '"') {
+                quoted = true;
+            } else if (c === ',') {
+                row.push(field);
+                field = '';
+            } else if (c === '\n' || c === '\r') {
+                if (c === '\r' && text[i + 1] === '\n') i++;
+                row.push(field);
+                rows.push(row);
+                row = [];
+                field = '';
+            } else {
+                field += c;
+            }
+        }
+        row.push(field);
+        rows.push(row);
+
+        // Ignore blank lines
+        return rows.filter(r => r.some(f => f.trim() !== ''));
+    }
+
+    private getBulkParameterSets(): Record<string, any>[] {
+        const bulkInput = document.getElementById('bulk-input') as HTMLTextAreaElement | null;
+        const rows = this.parseCsv(bulkInput?.value || '');
+        if (rows.length < 2) throw new Error('Paste a header row and at least one row of values');
+
+        const params = this.selectedAutomation!.parameters;
+        const header = rows[0].map(name => name.trim());
+        const unknown = header.filter(name => !params.some(p => p.name === name));
+        if (unknown.length) throw new Error(`Unknown column(s): ${unknown.join(', ')}`);
+
+        // Columns left out of the CSV take their value from the form
+        const shared = this.getParameterValues();
+
+        return rows.slice(1).map((row, i) => {
+            const values: Record<string, any> = { ...shared };
+
+            header.forEach((name, col) => {
+                const raw = (row[col] ?? '').trim();
+                const param = params.find(p => p.name === name)!;
+                values[name] = param.type === 'checkbox' ? ['true', 'yes', 'y', '1'].includes(raw.toLowerCase()) : raw;
+            });
+
+            params.forEach(param => {
+                if (param.required && param.type !== 'checkbox' && !String(values[param.name] ?? '').trim()) {
+                    throw new Error(`Row ${i + 1}: ${param.label} is required`);
+                }
+            });
+
+            return values;
+        });
+    }
+
+    private async runBatch(): Promise<void> {
+        if (!this.selectedAutomation) return;
+
+        let parameterSets: Record<string, any>[];
+        try {
+            parameterSets = this.getBulkParameterSets();
+        } catch (error) {
+            this.showError((error as Error).message);
+            return;
+        }
+
+        const runButton = document.getElementById('run-button') as HTMLButtonElement;
+        const outputDiv = document.getElementById('output');
+        const outputContent = document.getElementById('output-content');
+
+        if (!outputDiv || !outputContent) return;
+
+        runButton.disabled = true;
+        runButton.textContent = 'Running...';
+        outputDiv.style.display = 'block';
+        outputContent.innerHTML = `<div class="loading">Executing ${parameterSets.length} runs...</div>`;
+
+        try {
+            const response = await fetch('/api/run/batch', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    automation_id: this.selectedAutomation.id,
+                    parameters: parameterSets
+                })
+            });
+
+            if (this.redirectIfLoggedOut(response)) return;
+            let result = await response.json();
+
+            // Queued as one job per row: poll until all of them have finished
+            if (response.status === 202 && result.batch_id) {
+                result = await this.waitForBatch(result.batch_id, outputContent);
+                if (!result) return;
+            }
+
+            if (result.error) {
+                this.showOutput(`Error: ${result.error}`, 'error');
+                return;
+            }
+
+            const summary = result.summary;
+            const lines = [`${summary.succeeded} of ${summary.total} runs succeeded in ${summary.execution_time}s`, ''];
+            result.results.forEach((item: any) => {
+                // Last line of each run's output is usually its own summary
+                const detail = item.error || (item.success ? item.stdout : item.stderr || item.stdout) || '';
+                lines.push(`#${item.index + 1} ${item.success ? 'OK' : 'FAILED'}: ${detail.trim().split('\n').pop()}`);
+            });
+            this.showOutput(lines.join('\n'), summary.failed ? 'error' : 'success');
+        } catch (error) {
+            this.showOutput('Failed to execute batch: ' + error, 'error');
+        } finally {
+            runButton.disabled = false;
+            runButton.textContent = this.runButtonLabel();
+        }
+    }
+
     private async runAutomation(): Promise<void> {
         if (!this.selectedAutomation) return;
 
+        if (this.isBulkMode()) {
+            await this.runBatch();
+            return;
+        }
+
         if (!this.validateParameters()) {
             this.showError('Please fill in all required fields');
             return;
@@ -246,7 +409,14 @@ class AutomationUI {
                 })
             });
 
-            const result = await response.json();
+            if (this.redirectIfLoggedOut(response)) return;
+            let result = await response.json();
+
+            // Queued for a worker node: poll until it has finished
+            if (response.status === 202 && result.job_id) {
+                result = await this.waitForJob(result.job_id, outputContent);
+                if (!result) return;
+            }
 
             if (result.error) {
                 this.showOutput(`Error: ${result.error}`, 'error');
@@ -265,6 +435,53 @@ class AutomationUI {
         }
     }
 
+    private async waitForJob(jobId: number, outputContent: HTMLElement): Promise<any> {
+        let delay = 500;
+
+        while (true) {
+            await new Promise(resolve => setTimeout(resolve, delay));
+            delay = Math.min(delay * 2, 2000);
+
+            const response = await fetch(`/api/jobs/${jobId}`);
+            if (this.redirectIfLoggedOut(response)) return null;
+            const job = await response.json();
+
+            if (!response.ok) return { error: job.error || 'Job status unavailable' };
+            if (job.status === 'succeeded' || job.status === 'failed') {
+                return job.result || { error: 'Job finished without a result' };
+            }
+
+            const state = job.status === 'running' ? `Running (attempt ${job.attempts})` : 'Queued';
+            outputContent.innerHTML = `<div class="loading">${state}...</div>`;
+        }
+    }
+
+    private async waitForBatch(batchId: string, outputContent: HTMLElement): Promise<any> {
+        let delay = 500;
+
+        while (true) {
+            await new Promise(resolve => setTimeout(resolve, delay));
+            delay = Math.min(delay * 2, 2000);
+
+            const response = await fetch(`/api/batches/${batchId}`);
+            if (this.redirectIfLoggedOut(response)) return null;
+            const batch = await response.json();
+
+            if (!response.ok) return { error: batch.error || 'Batch status unavailable' };
+            if (batch.status === 'finished') return batch;
+
+            const summary = batch.summary;
+            outputContent.innerHTML = `<div class="loading">${summary.total - summary.pending} of ${summary.total} runs finished...</div>`;
+        }
+    }
+
+    private redirectIfLoggedOut(response: Response): boolean {
+        // The session could not be refreshed: start a new login
+        if (response.status !== 401) return false;
+        window.location.href = '/login';
+        return true;
+    }
+
     private showOutput(message: string, type: 'success' | 'error'): void {
         const outputDiv = document.getElementById('output');
         const outputContent = document.getElementById('output-content');
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Automation Queue Worker
+
+Claims jobs from the MySQL jobs table (see job_queue.py) and runs them
+with the same execution core as the web app. Run any number per host,
+on any number of hosts:
+
+    python worker.py --concurrency 2
+
+Each thread works on one job at a time and renews its lease every third
+of JOB_LEASE_SECONDS; if the lease is lost (another worker took the job
+over) the run is killed and its result dropped. SIGTERM stops claiming
+new jobs and lets running ones finish.
+"""
+
+import argparse
+import os
+import random
+import signal
+import socket
+import threading
+import time
+
+import core
+import job_queue
+from resource_limits import init_cgroups
+
+WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', 2))
+POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', 1.0))
+MAX_POLL_INTERVAL = 10.0
+
+stopping = threading.Event()
+
+
+def keep_lease(job, worker_id, done, kill):
+    """Heartbeat until done is set; kills the run if the lease is lost"""
+    while not done.wait(job_queue.JOB_LEASE_SECONDS / 3):
+        try:
+            if job_queue.heartbeat(job['id'], worker_id):
+                continue
+        except Exception as e:
+            # Keep running; the lease only lapses if this persists
+            print(f"[{worker_id}] Heartbeat for job {job['id']} failed: {e}")
+            continue
+
+        print(f"[{worker_id}] Lost lease on job {job['id']}, stopping it")
+        if kill:
+            kill[0]()
+        return
+
+
+def run_job(job, worker_id):
+    start = time.monotonic()
+    automation = core.find_automation(job['automation_id'])
+    params = job['parameters'] or {}
+    done = threading.Event()
+    kill = []
+
+    heartbeat = threading.Thread(target=keep_lease, args=(job, worker_id, done, kill), daemon=True)
+    heartbeat.start()
+    try:
+        if not automation:
+            body, output = {'error': 'Automation not found'}, 'Automation not found'
+        elif not (core.APP_DIR / automation['script']).exists():
+            body, output = {'error': 'Script not found'}, 'Script not found'
+        elif not job_queue.runs_on_workers(automation):
+            # Its paths refer to the web node; queued before the flag was set
+            body, output = {'error': 'This automation only runs on the web node'}, 'Not runnable on workers'
+        else:
+            body, _, output = core.execute(automation, params, on_start=kill.append)
+    except Exception as e:
+        body, output = {'error': str(e)}, str(e)
+    finally:
+        done.set()
+        heartbeat.join()
+
+    exec_time = time.monotonic() - start
+    success = body.get('success', False)
+
+    try:
+        if not job_queue.complete(job['id'], worker_id, success, body):
+            print(f"[{worker_id}] Job {job['id']} was taken over; result dropped")
+            return
+    except Exception as e:
+        # The lease will expire and another worker retries the job
+        print(f"[{worker_id}] Could not record result of job {job['id']}: {e}")
+        return
+
+    core.log_run(job['user_id'], job['automation_id'], automation['name'] if automation else 'Unknown',
+                 params, success, output, exec_time)
+    print(f"[{worker_id}] Job {job['id']} ({job['automation_id']}) "
+          f"{'succeeded' if success else 'failed'} in {exec_time:.1f}s")
+
+
+def worker_loop(worker_id):
+    db = None
+    delay = POLL_INTERVAL
+
+    while not stopping.is_set():
+        job = None
+        try:
+            if db is None:
+                db = job_queue.connect()
+            job = job_queue.claim(db, worker_id)
+        except Exception as e:
+            print(f"[{worker_id}] Claim failed: {e}")
+            if db is not None:
+                try:
+                    db.close()
+                except Exception:
+                    pass
+            db = None
+
+        if job is None:
+            # Idle: back off, with jitter so workers do not poll in lockstep
+            stopping.wait(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, MAX_POLL_INTERVAL)
+            continue
+
+        delay = POLL_INTERVAL
+        run_job(job, worker_id)
+
+    if db is not None:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run queued automation jobs')
+    parser.add_argument('--concurrency', type=int, default=WORKER_CONCURRENCY,
+                        help='Jobs run at once by this process')
+    args = parser.parse_args()
+
+    def stop(signum, frame):
+        print("Stopping: finishing running jobs, claiming no new ones")
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    init_cgroups()
+
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    threads = [threading.Thread(target=worker_loop, args=(f"{prefix}:{n}",), name=f"worker-{n}")
+               for n in range(args.concurrency)]
+    print(f"Worker {prefix} started with {args.concurrency} threads "
+          f"(lease {job_queue.JOB_LEASE_SECONDS}s)")
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
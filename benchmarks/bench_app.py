@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark WSGI Entry Points
+
+Imports the real applications with MySQL replaced by the SQLite stand-in.
+run.py sets BENCH_SQLITE_PATH and the stub Cognito variables, then serves
+one of:
+
+    bench_app:db_app        app.py (DB/bcrypt auth)
+    bench_app:cognito_app   app_cognito.py (Cognito auth)
+
+either with the Werkzeug dev server (python bench_app.py --variant db)
+or with Gunicorn (gunicorn --pythonpath benchmarks bench_app:db_app).
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent / 'app'
+
+sys.path.insert(0, str(APP_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+# The apps create their working directories relative to the cwd on import
+os.chdir(APP_DIR)
+
+import sqlite_db  # noqa: E402
+
+sqlite_db.install(os.environ['BENCH_SQLITE_PATH'])
+
+VARIANTS = {
+    'db': 'app',
+    'cognito': 'app_cognito',
+}
+
+
+def load_app(variant):
+    module = __import__(VARIANTS[variant])
+    return module.app
+
+
+def __getattr__(name):
+    # Lazy so a Gunicorn worker only imports the variant it serves
+    if name.endswith('_app') and name[:-4] in VARIANTS:
+        return load_app(name[:-4])
+    raise AttributeError(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve an app variant for benchmarking')
+    parser.add_argument('--variant', choices=sorted(VARIANTS), default='db')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    from werkzeug.serving import run_simple
+    run_simple(args.host, args.port, load_app(args.variant), threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare Two Benchmark Result Files
+
+Prints per-benchmark deltas between a baseline and a candidate run of
+benchmarks/run.py and exits non-zero when anything regressed by more
+than the threshold.
+
+    python benchmarks/compare.py baseline.json candidate.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+
+# (section, metric, True if higher is better)
+METRICS = [
+    ('http', 'throughput_rps', True),
+    ('http', 'p99_ms', False),
+    ('micro', 'mean_s', False),
+    ('startup', 'import_s', False),
+    ('startup', 'rss_mb', False),
+]
+
+
+def compare(baseline, candidate, threshold):
+    rows = []
+    for section, metric, higher_is_better in METRICS:
+        for name, base in baseline.get(section, {}).items():
+            cand = candidate.get(section, {}).get(name)
+            if cand is None or not base.get(metric):
+                continue
+            change = (cand[metric] - base[metric]) / base[metric] * 100
+            worse = -change if higher_is_better else change
+            rows.append({
+                'name': f"{section}.{name}",
+                'metric': metric,
+                'baseline': base[metric],
+                'candidate': cand[metric],
+                'change_pct': round(change, 1),
+                'regression': worse > threshold,
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent change that counts as a regression')
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    rows = compare(baseline, candidate, args.threshold)
+    width = max((len(r['name']) for r in rows), default=10)
+    print(f"{'benchmark':<{width}}  {'metric':<15}{'baseline':>12}{'candidate':>12}{'change':>10}")
+    for r in rows:
+        flag = '  REGRESSION' if r['regression'] else ''
+        print(f"{r['name']:<{width}}  {r['metric']:<15}{r['baseline']:>12}"
+              f"{r['candidate']:>12}{r['change_pct']:>9}%{flag}")
+
+    regressions = [r for r in rows if r['regression']]
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold}%")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
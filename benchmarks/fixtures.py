@@ -0,0 +1,71 @@
+"""
+Synthetic Benchmark Data
+
+Deterministic file trees and recipient lists for the automation scripts.
+Everything is generated from a seed so runs are comparable.
+"""
+
+import os
+import random
+import time
+from pathlib import Path
+
+EXTENSIONS = ['txt', 'pdf', 'jpg', 'png', 'csv', 'log', 'docx', 'zip', 'json', '']
+
+
+def _write_file(path, size, rng):
+    # Half-compressible content so zip ratios are realistic
+    chunk = bytes(rng.getrandbits(8) for _ in range(256)) + b'A' * 256
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining > 0:
+            f.write(chunk[:remaining])
+            remaining -= len(chunk)
+
+
+def make_flat_folder(root, files=500, size=4096, seed=0):
+    """Files directly under root, as file_organizer expects"""
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+
+    for i in range(files):
+        ext = rng.choice(EXTENSIONS)
+        path = root / (f"file_{i:05d}.{ext}" if ext else f"file_{i:05d}")
+        _write_file(path, rng.randint(size // 4, size * 2), rng)
+        # Spread mtimes over ~2 years for the date strategy
+        mtime = now - rng.randint(0, 730) * 86400
+        os.utime(path, (mtime, mtime))
+    return root
+
+
+def make_file_tree(root, files=1000, dirs=20, size=16384, seed=0):
+    """Nested tree for data_backup"""
+    rng = random.Random(seed)
+    root = Path(root)
+    subdirs = [root]
+    for i in range(dirs):
+        parent = rng.choice(subdirs)
+        subdir = parent / f"dir_{i:03d}"
+        subdir.mkdir(parents=True, exist_ok=True)
+        subdirs.append(subdir)
+
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        ext = rng.choice(EXTENSIONS) or 'bin'
+        _write_file(rng.choice(subdirs) / f"file_{i:05d}.{ext}",
+                    rng.randint(size // 4, size * 2), rng)
+    return root
+
+
+def make_recipients(count=1000, seed=0):
+    """Comma-separated recipient list in the email_sender input format"""
+    rng = random.Random(seed)
+    domains = ['example.com', 'example.org', 'corp.example.net']
+    return ', '.join(f"user{i:05d}.{rng.randint(0, 9999)}@{rng.choice(domains)}" for i in range(count))
+
+
+def tree_size(root):
+    """Total bytes of regular files under root"""
+    return sum(p.stat().st_size for p in Path(root).rglob('*') if p.is_file())
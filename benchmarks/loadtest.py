@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Test Harness
+
+Drives one or more running servers with a fixed number of concurrent
+clients and reports throughput and latency percentiles per target, so the
+Gunicorn (app_cognito:app) and ASGI (app_async:app) deployments can be
+compared side by side.
+
+Example:
+    # terminal 1: gunicorn --workers 3 --bind 127.0.0.1:5001 app_cognito:app
+    # terminal 2: hypercorn --bind 127.0.0.1:5002 app_async:app
+    python benchmarks/loadtest.py \\
+        --target gunicorn=http://127.0.0.1:5001 \\
+        --target asgi=http://127.0.0.1:5002 \\
+        --cookie "session=..." \\
+        --path /api/automations --concurrency 50 --duration 20 \\
+        --json results/loadtest.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    """Reduce raw latencies (seconds) into a result dict (milliseconds)"""
+    latencies = sorted(latencies)
+    requests = len(latencies) + errors
+    return {
+        'requests': requests,
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+def response_ok(path, response):
+    """Whether a response counts as a success
+
+    /api/run and /api/run/batch answer 200 even when the script failed,
+    so for those the body has to say success too.
+    """
+    if response.status_code >= 400:
+        return False
+    if not path.startswith('/api/run'):
+        return True
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    if not isinstance(body, dict):
+        return False
+    if body.get('success') is False:
+        return False
+    return not body.get('summary', {}).get('failed')
+
+
+async def run_load(base_url, method, path, body=None, headers=None,
+                   concurrency=10, duration=10.0, requests=None, timeout=330.0,
+                   form=None, body_factory=None, fresh_session=False):
+    """Hit base_url+path from `concurrency` clients for `duration` seconds
+    (or until `requests` have been issued) and return summarize() output.
+    `body` is sent as JSON, `form` as a url-encoded form. `body_factory`,
+    if given, builds a new JSON body per request (untimed, in a thread);
+    `fresh_session` drops cookies before each request, so e.g. every
+    POST /login is a real login rather than an "already logged in" redirect."""
+    latencies = []
+    errors = 0
+    issued = 0
+    deadline = time.perf_counter() + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers or {},
+                                 limits=limits, timeout=timeout,
+                                 follow_redirects=False) as client:
+
+        async def worker():
+            nonlocal errors, issued
+            while time.perf_counter() < deadline:
+                if requests is not None:
+                    if issued >= requests:
+                        return
+                    issued += 1
+                request_body = await asyncio.to_thread(body_factory) if body_factory else body
+                if fresh_session:
+                    client.cookies.clear()
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=request_body, data=form)
+                    ok = response_ok(path, response)
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, errors, elapsed)
+
+
+def print_table(results):
+    columns = ('requests', 'errors', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms')
+    print(f"{'target':<16}" + ''.join(f"{c:>16}" for c in columns))
+    for name, result in results.items():
+        print(f"{name:<16}" + ''.join(f"{result[c]:>16}" for c in columns))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Load test one or more automation UI servers')
+    parser.add_argument('--target', action='append', required=True,
+                        help='name=base_url, may be given several times')
+    parser.add_argument('--path', default='/api/automations', help='Request path')
+    parser.add_argument('--method', default='GET', help='HTTP method')
+    parser.add_argument('--body', help='JSON request body, e.g. for POST /api/run')
+    parser.add_argument('--cookie', help='Cookie header of an authenticated session')
+    parser.add_argument('--concurrency', type=int, default=10, help='Concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per target')
+    parser.add_argument('--requests', type=int, help='Stop after this many requests')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    body = json.loads(args.body) if args.body else None
+    headers = {'Cookie': args.cookie} if args.cookie else {}
+
+    results = {}
+    for target in args.target:
+        name, _, base_url = target.partition('=')
+        if not base_url:
+            base_url = name
+        print(f"Loading {name}: {args.method} {base_url}{args.path} "
+              f"(concurrency={args.concurrency}, duration={args.duration}s)")
+        results[name] = asyncio.run(run_load(
+            base_url, args.method, args.path, body, headers,
+            args.concurrency, args.duration, args.requests))
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'path': args.path,
+                'method': args.method,
+                'concurrency': args.concurrency,
+                'duration_s': args.duration,
+                'results': results,
+            }, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    return 1 if any(r['errors'] for r in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
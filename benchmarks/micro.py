@@ -0,0 +1,147 @@
+"""
+Microbenchmarks for the Automation Scripts
+
+Calls the script functions in-process (stdout discarded) on fresh
+synthetic data for every iteration, timing only the function call.
+"""
+
+import contextlib
+import importlib.util
+import io
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fixtures
+from stub_connectors import DEFAULT_SYSTEMS, StubConnectors
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'app' / 'scripts'
+
+
+def load_script(name):
+    """Import app/scripts/<name>.py as a module"""
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    # Registered so process pools in the script can pickle its functions
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_call(fn, setup=None, iterations=5):
+    """Run setup() (untimed) then fn(*setup_result) per iteration"""
+    samples = []
+    for _ in range(iterations):
+        args = setup() if setup else ()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn(*args)
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'mean_s': round(statistics.fmean(samples), 6),
+        'min_s': round(samples[0], 6),
+        'max_s': round(samples[-1], 6),
+        'stdev_s': round(statistics.stdev(samples), 6) if len(samples) > 1 else 0.0,
+    }
+
+
+def bench_file_organizer(workdir, files, iterations):
+    organizer = load_script('file_organizer')
+    results = {}
+    for method in ('extension', 'date', 'size'):
+        fn = getattr(organizer, f"organize_by_{method}")
+        counter = iter(range(iterations))
+
+        def setup():
+            folder = Path(workdir) / f"organize_{method}_{next(counter)}"
+            return (str(fixtures.make_flat_folder(folder, files=files)),)
+
+        result = time_call(fn, setup, iterations)
+        result['files'] = files
+        result['files_per_s'] = round(files / result['mean_s'], 1)
+        results[f"file_organizer.{method}"] = result
+    return results
+
+
+def bench_data_backup(workdir, files, iterations):
+    backup = load_script('data_backup')
+    source = fixtures.make_file_tree(Path(workdir) / 'backup_source', files=files)
+    total_mb = fixtures.tree_size(source) / (1024 * 1024)
+    results = {}
+
+    for label, fn in (('compress', backup.backup_with_compression),
+                      ('copy', backup.backup_without_compression)):
+        def setup():
+            destination = Path(workdir) / f"backup_dest_{label}"
+            shutil.rmtree(destination, ignore_errors=True)
+            return str(source), str(destination)
+
+        result = time_call(fn, setup, iterations)
+        result['files'] = files
+        result['mb'] = round(total_mb, 2)
+        result['mb_per_s'] = round(total_mb / result['mean_s'], 2)
+        results[f"data_backup.{label}"] = result
+
+    # Verification: "cold" hashes everything, "warm" reuses the manifest
+    with contextlib.redirect_stdout(io.StringIO()):
+        backup_path = backup.backup_with_compression(str(source), str(Path(workdir) / 'backup_dest_verify'))
+    manifest = backup_path.with_name(backup_path.name + backup.MANIFEST_SUFFIX)
+    for label, keep_manifest in (('cold', False), ('warm', True)):
+        def setup():
+            if not keep_manifest:
+                manifest.unlink(missing_ok=True)
+            return str(source), str(backup_path)
+
+        result = time_call(backup.verify_backup, setup, iterations)
+        result['files'] = files
+        result['workers'] = backup.default_workers()
+        # Source plus backup, whether hashed or answered from the manifest
+        result['mb'] = round(2 * total_mb, 2)
+        result['verified_mb_per_s'] = round(2 * total_mb / result['mean_s'], 2)
+        results[f"data_backup.verify_{label}"] = result
+    return results
+
+
+def bench_email_sender(recipients, iterations):
+    sender = load_script('email_sender')
+    recipient_list = fixtures.make_recipients(recipients)
+    result = time_call(lambda: sender.send_emails(recipient_list, 'Benchmark', 'Body'),
+                       iterations=iterations)
+    result['recipients'] = recipients
+    result['recipients_per_s'] = round(recipients / result['mean_s'], 1)
+    return {'email_sender.send': result}
+
+
+def bench_offboard(workdir, iterations):
+    """Dry-run offboarding against stub systems with fixed latencies"""
+    offboard = load_script('offboard')
+    # No injected failures, so every iteration does the same work
+    stub = StubConnectors({name: {'latency': spec['latency']} for name, spec in DEFAULT_SYSTEMS.items()})
+    stub.start()
+    try:
+        config = stub.write_config(str(Path(workdir) / 'offboarding_stub.json'))
+        result = time_call(lambda: offboard.offboard('departing.user@example.com', False, config),
+                           iterations=iterations)
+    finally:
+        stub.stop()
+
+    latencies = [spec['latency'] for spec in stub.systems.values()]
+    result['systems'] = len(latencies)
+    result['slowest_system_s'] = max(latencies)
+    result['sum_of_systems_s'] = round(sum(latencies), 3)
+    return {'offboard.dry_run': result}
+
+
+def run_all(files=500, backup_files=1000, recipients=5000, iterations=5):
+    with tempfile.TemporaryDirectory(prefix='automation-micro-') as workdir:
+        results = {}
+        results.update(bench_file_organizer(workdir, files, iterations))
+        results.update(bench_data_backup(workdir, backup_files, iterations))
+        results.update(bench_email_sender(recipients, iterations))
+        results.update(bench_offboard(workdir, iterations))
+        return results
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Job Queue Throughput Test
+
+Enqueues --jobs email_sender runs into the jobs table and drains them with
+N local worker.py processes, reporting jobs/s per worker count. With
+--kill-one, one worker is SIGKILLed mid-run to check that the job it held
+is re-claimed by another worker once its lease expires.
+
+Needs a real MySQL 8 (SKIP LOCKED is not available in the SQLite
+stand-in) with app/database_setup.sql applied, reached through the usual
+DB_* variables or app/.env:
+
+    python benchmarks/queue_bench.py --workers 1,2,4 --jobs 200
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / 'app'
+sys.path.insert(0, str(APP_DIR))
+
+import job_queue  # noqa: E402
+
+PARAMS = {'recipients': 'a@example.com, b@example.com', 'subject': 'Queue bench', 'message': 'm'}
+
+
+def job_counts(job_ids):
+    db = job_queue.connect()
+    try:
+        cursor = db.cursor()
+        cursor.execute(
+            "SELECT status, COUNT(*), SUM(attempts > 1) FROM jobs WHERE id BETWEEN %s AND %s GROUP BY status",
+            (min(job_ids), max(job_ids))
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        db.close()
+    counts = {status: int(count) for status, count, _ in rows}
+    counts['retried'] = sum(int(retried or 0) for _, _, retried in rows)
+    return counts
+
+
+def delete_jobs(job_ids):
+    db = job_queue.connect()
+    try:
+        cursor = db.cursor()
+        cursor.execute("DELETE FROM jobs WHERE id BETWEEN %s AND %s", (min(job_ids), max(job_ids)))
+        db.commit()
+        cursor.close()
+    finally:
+        db.close()
+
+
+def run_once(workers, jobs, args):
+    job_ids = [job_queue.enqueue(args.user_id, 'email_sender', PARAMS) for _ in range(jobs)]
+
+    env = dict(os.environ, JOB_LEASE_SECONDS=str(args.lease), WORKER_POLL_INTERVAL='0.2')
+    start = time.monotonic()
+    procs = [subprocess.Popen([sys.executable, 'worker.py', '--concurrency', str(args.concurrency)],
+                              cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL)
+             for _ in range(workers)]
+    killed = False
+
+    try:
+        while True:
+            time.sleep(0.2)
+            counts = job_counts(job_ids)
+            done = counts.get('succeeded', 0) + counts.get('failed', 0)
+
+            if args.kill_one and not killed and workers > 1 and done >= jobs // 4:
+                procs[0].send_signal(signal.SIGKILL)
+                killed = True
+
+            if done >= jobs:
+                break
+            if time.monotonic() - start > args.timeout:
+                print(f"  timed out with {done}/{jobs} jobs finished")
+                break
+        elapsed = time.monotonic() - start
+    finally:
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in procs:
+            proc.wait(timeout=30)
+        final = job_counts(job_ids)
+        delete_jobs(job_ids)
+
+    return {
+        'workers': workers,
+        'concurrency_per_worker': args.concurrency,
+        'jobs': jobs,
+        'elapsed_s': round(elapsed, 3),
+        'jobs_per_s': round(jobs / elapsed, 2),
+        'succeeded': final.get('succeeded', 0),
+        'failed': final.get('failed', 0),
+        'retried_after_lost_lease': final['retried'],
+        'killed_one_worker': killed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure job queue throughput with local workers')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker process counts')
+    parser.add_argument('--concurrency', type=int, default=1, help='Threads per worker process')
+    parser.add_argument('--jobs', type=int, default=100, help='Jobs per run')
+    parser.add_argument('--lease', type=int, default=6, help='JOB_LEASE_SECONDS for the workers')
+    parser.add_argument('--user-id', default='1', help='users.id the jobs (and their log rows) belong to')
+    parser.add_argument('--kill-one', action='store_true',
+                        help='SIGKILL one worker mid-run to exercise lease expiry')
+    parser.add_argument('--timeout', type=float, default=600, help='Give up on a run after this many seconds')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    results = []
+    for workers in [int(w) for w in args.workers.split(',') if w]:
+        print(f"{workers} worker(s) x {args.concurrency} thread(s), {args.jobs} jobs ...", flush=True)
+        result = run_once(workers, args.jobs, args)
+        results.append(result)
+        print(f"  {result['jobs_per_s']} jobs/s, {result['succeeded']} succeeded, "
+              f"{result['failed']} failed, {result['retried_after_lost_lease']} re-claimed")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
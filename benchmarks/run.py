@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite Runner
+
+Self-contained: a SQLite stand-in replaces MySQL, a stub Cognito/JWKS
+server replaces AWS, and all file trees/recipient lists are synthetic.
+Measures throughput and tail latency of the web paths against each app
+variant, worker startup cost (import time, RSS) per auth backend, and
+microbenchmarks of the automation scripts, and writes everything to one
+JSON file for benchmarks/compare.py.
+
+Examples:
+    python benchmarks/run.py --out results/baseline.json
+    python benchmarks/run.py --quick --only micro
+    python benchmarks/run.py --server gunicorn --workers 1,3,6 --only http
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+import fixtures
+import loadtest
+import micro
+import startup
+import sqlite_db
+from stub_cognito import StubCognito
+from stub_connectors import StubConnectors
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+CONFIG_PATH = REPO_DIR / 'app' / 'config' / 'automations_config.json'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_server(base_url, proc, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            httpx.get(f"{base_url}/login", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start within {timeout}s")
+
+
+def start_server(variant, env, server, workers):
+    port = free_port()
+    if server == 'gunicorn':
+        cmd = [sys.executable, '-m', 'gunicorn', '--pythonpath', str(BENCH_DIR),
+               '--workers', str(workers), '--bind', f"127.0.0.1:{port}",
+               '--timeout', '330', f"bench_app:{variant}_app"]
+    else:
+        cmd = [sys.executable, str(BENCH_DIR / 'bench_app.py'),
+               '--variant', variant, '--port', str(port)]
+    proc = subprocess.Popen(cmd, env=env, cwd=REPO_DIR / 'app',
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_for_server(base_url, proc)
+    except Exception:
+        proc.kill()
+        raise
+    return proc, base_url
+
+
+def session_cookie(variant, base_url):
+    """Log in once and return the Cookie header for authenticated scenarios"""
+    with httpx.Client(base_url=base_url, follow_redirects=False) as client:
+        if variant == 'db':
+            client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+        else:
+            client.get('/callback', params={'code': 'benchuser'})
+        if 'session' not in client.cookies:
+            raise RuntimeError(f"Login against {variant} app did not yield a session")
+        return f"session={client.cookies['session']}"
+
+
+def run_parameters(workdir, recipients):
+    """Synthetic /api/run parameters per automation id"""
+    backup_src = fixtures.make_file_tree(Path(workdir) / 'run_backup_src', files=200)
+    return {
+        # source_folder is filled in per request, see FreshOrganizeFolders
+        'file_organizer': {'organize_by': 'extension'},
+        'email_sender': {'recipients': fixtures.make_recipients(recipients),
+                         'subject': 'Benchmark', 'message': 'Synthetic message'},
+        'data_backup': {'source': str(backup_src),
+                        'destination': str(Path(workdir) / 'run_backup_dest'),
+                        'compress': True},
+        'user_offboarding': {'email': 'departing.user@example.com', 'fanged': False},
+    }
+
+
+class FreshOrganizeFolders:
+    """Body factory for run.file_organizer: a new unorganized folder per request
+
+    Reusing one folder would leave nothing to organize after the first run.
+    """
+
+    def __init__(self, root, params, files):
+        self.root = Path(root)
+        self.params = params
+        self.files = files
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        folder = fixtures.make_flat_folder(self.root / f"organize_{self.count:05d}", files=self.files)
+        return {'automation_id': 'file_organizer',
+                'parameters': dict(self.params, source_folder=str(folder))}
+
+
+def http_scenarios(variant, cookie, params, args, workdir):
+    """(name, run_load kwargs) pairs for one app variant"""
+    auth = {'Cookie': cookie}
+    with open(CONFIG_PATH) as f:
+        automations = json.load(f)['automations']
+
+    scenarios = [
+        ('automations', dict(method='GET', path='/api/automations', headers=auth,
+                             concurrency=args.concurrency, duration=args.duration)),
+    ]
+
+    for automation in automations:
+        if not (REPO_DIR / 'app' / automation['script']).exists():
+            continue
+        scenario = dict(method='POST', path='/api/run', headers=auth,
+                        body={'automation_id': automation['id'],
+                              'parameters': params.get(automation['id'], {})},
+                        concurrency=args.run_concurrency, duration=args.duration)
+        if automation['id'] == 'file_organizer':
+            scenario['body_factory'] = FreshOrganizeFolders(
+                Path(workdir) / f"run_organize_{variant}", params['file_organizer'], args.files)
+        scenarios.append((f"run.{automation['id']}", scenario))
+
+    # The same email run fanned out over one /api/run/batch request
+    if 'email_sender' in params and (REPO_DIR / 'app' / 'scripts' / 'email_sender.py').exists():
+        scenarios.append(('batch.email_sender', dict(
+            method='POST', path='/api/run/batch', headers=auth,
+            body={'automation_id': 'email_sender',
+                  'parameters': [params['email_sender']] * args.batch_size},
+            concurrency=1, duration=args.duration)))
+
+    if variant == 'db':
+        scenarios.append(('login', dict(
+            method='POST', path='/login',
+            form={'username': 'admin', 'password': 'admin123'}, fresh_session=True,
+            concurrency=args.run_concurrency, duration=args.duration)))
+    else:
+        scenarios.append(('callback', dict(
+            method='GET', path='/callback?code=benchuser', fresh_session=True,
+            concurrency=args.concurrency, duration=args.duration)))
+    return scenarios
+
+
+def run_http(args, workdir):
+    db_path = str(Path(workdir) / 'bench.sqlite3')
+    sqlite_db.create_database(db_path)
+
+    stub = StubCognito()
+    stub.start()
+    connectors = StubConnectors()
+    connectors.start()
+
+    env = dict(os.environ, **stub.app_env(), BENCH_SQLITE_PATH=db_path,
+               SECRET_KEY='benchmark-secret-key', APP_DOMAIN='127.0.0.1',
+               SESSION_BACKEND='sqlite',
+               SESSION_SQLITE_PATH=str(Path(workdir) / 'sessions.sqlite3'),
+               OFFBOARDING_CONNECTORS=connectors.write_config(str(Path(workdir) / 'offboarding_stub.json')))
+    params = run_parameters(workdir, args.recipients)
+    worker_counts = args.workers if args.server == 'gunicorn' else [None]
+
+    results = {}
+    try:
+        for variant in args.variants:
+            for workers in worker_counts:
+                label = variant if workers is None else f"{variant}.w{workers}"
+                proc, base_url = start_server(variant, env, args.server, workers)
+                try:
+                    cookie = session_cookie(variant, base_url)
+                    for name, kwargs in http_scenarios(variant, cookie, params, args, workdir):
+                        print(f"  [{label}] {name} ...", flush=True)
+                        results[f"{label}.{name}"] = asyncio.run(
+                            loadtest.run_load(base_url, **kwargs))
+                        factory = kwargs.get('body_factory')
+                        if factory is not None:
+                            results[f"{label}.{name}"]['fresh_folders'] = factory.count
+                            shutil.rmtree(factory.root, ignore_errors=True)
+                finally:
+                    proc.terminate()
+                    proc.wait(timeout=10)
+    finally:
+        stub.stop()
+        connectors.stop()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the automation UI benchmark suite')
+    parser.add_argument('--out', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument('--only', choices=['http', 'micro', 'startup'], help='Run just one part')
+    parser.add_argument('--quick', action='store_true', help='Small sizes and short durations')
+    parser.add_argument('--variants', default='db,cognito',
+                        help='Comma-separated app variants (auth backends) for HTTP and startup')
+    parser.add_argument('--server', choices=['werkzeug', 'gunicorn'], default='werkzeug')
+    parser.add_argument('--workers', default='3',
+                        help='Comma-separated Gunicorn worker counts to compare')
+    parser.add_argument('--concurrency', type=int, default=20,
+                        help='Clients for cheap routes')
+    parser.add_argument('--run-concurrency', type=int, default=4,
+                        help='Clients for /api/run and login (bcrypt)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per HTTP scenario')
+    parser.add_argument('--files', type=int, default=500, help='Files per file_organizer run')
+    parser.add_argument('--backup-files', type=int, default=1000, help='Files in the backup tree')
+    parser.add_argument('--recipients', type=int, default=5000, help='email_sender recipients')
+    parser.add_argument('--iterations', type=int, default=5, help='Microbenchmark iterations')
+    parser.add_argument('--batch-size', type=int, default=20, help='Parameter sets per /api/run/batch')
+    args = parser.parse_args(argv)
+
+    args.variants = [v for v in args.variants.split(',') if v]
+    args.workers = [int(w) for w in args.workers.split(',') if w]
+    if args.quick:
+        args.duration = min(args.duration, 3.0)
+        args.files = min(args.files, 100)
+        args.backup_files = min(args.backup_files, 200)
+        args.recipients = min(args.recipients, 500)
+        args.iterations = min(args.iterations, 2)
+        args.batch_size = min(args.batch_size, 5)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': {k: v for k, v in vars(args).items() if k != 'out'},
+        },
+    }
+
+    with tempfile.TemporaryDirectory(prefix='automation-bench-') as workdir:
+        if args.only in (None, 'http'):
+            print("HTTP benchmarks")
+            report['http'] = run_http(args, workdir)
+        if args.only in (None, 'startup'):
+            print("Worker startup")
+            report['startup'] = startup.run_all(args.variants, args.iterations)
+        if args.only in (None, 'micro'):
+            print("Script microbenchmarks")
+            report['micro'] = micro.run_all(args.files, args.backup_files,
+                                            args.recipients, args.iterations)
+
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
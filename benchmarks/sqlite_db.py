@@ -0,0 +1,128 @@
+"""
+SQLite stand-in for MySQL
+
+Implements the small part of the mysql.connector API the app uses
+(connect / cursor(dictionary=True) / execute / executemany / fetchone /
+fetchall / commit / close) on top of a local SQLite file. install()
+replaces mysql.connector.connect, so the app code runs unchanged.
+"""
+
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    email VARCHAR(100),
+    full_name VARCHAR(100),
+    is_active BOOLEAN DEFAULT TRUE,
+    session_version INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP NULL
+);
+
+CREATE TABLE IF NOT EXISTS automation_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INT NOT NULL,
+    automation_id VARCHAR(50) NOT NULL,
+    automation_name VARCHAR(100),
+    parameters TEXT,
+    success BOOLEAN,
+    output TEXT,
+    execution_time FLOAT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Same accounts as database_setup.sql, hashed at the production cost (12)
+USERS = [
+    ('admin', 'admin123', 'admin@example.com', 'Administrator'),
+    ('user', 'password', 'user@example.com', 'Standard User'),
+]
+BCRYPT_ROUNDS = 12
+
+
+def _translate(query):
+    return query.replace('%s', '?')
+
+
+class Cursor:
+    def __init__(self, conn, dictionary=False):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, query, params=()):
+        self._cursor.execute(_translate(query), params)
+
+    def executemany(self, query, seq_of_params):
+        self._cursor.executemany(_translate(query), seq_of_params)
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {d[0]: v for d, v in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class Connection:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, timeout=30)
+
+    def cursor(self, dictionary=False, **kwargs):
+        return Cursor(self._conn, dictionary)
+
+    def is_connected(self):
+        return True
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def create_database(path):
+    """Create the schema and seed the demo users"""
+    import bcrypt
+
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SCHEMA)
+    for username, password, email, full_name in USERS:
+        password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+        conn.execute(
+            "INSERT OR IGNORE INTO users (username, password_hash, email, full_name) VALUES (?, ?, ?, ?)",
+            (username, password_hash, email, full_name)
+        )
+    conn.commit()
+    conn.close()
+
+
+def install(path):
+    """Route every mysql.connector.connect() call to the SQLite file at path"""
+    import mysql.connector
+
+    def connect(**kwargs):
+        return Connection(path)
+
+    mysql.connector.connect = connect
@@ -0,0 +1,56 @@
+"""
+Worker Startup Benchmark
+
+Measures what each Gunicorn worker pays before serving its first request:
+time to import the app and build it with create_app(), peak RSS, and
+which heavyweight auth dependencies ended up imported. Each sample runs
+in a fresh interpreter.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / 'app'
+
+# Modules that should only be loaded by the backend that needs them
+HEAVY_MODULES = ['boto3', 'botocore', 'jose', 'requests', 'bcrypt', 'flask_login']
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+from factory import create_app
+create_app(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'import_s': elapsed,
+    'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+    'heavy': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def sample(backend):
+    result = subprocess.run([sys.executable, '-c', PROBE, backend], cwd=APP_DIR,
+                            capture_output=True, text=True, check=True)
+    # The last line is the probe output; anything before is app logging
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_all(backends=('db', 'cognito'), iterations=5):
+    results = {}
+    for backend in backends:
+        samples = [sample(backend) for _ in range(iterations)]
+        times = sorted(s['import_s'] for s in samples)
+        results[backend] = {
+            'iterations': iterations,
+            'import_s': round(statistics.median(times), 4),
+            'import_min_s': round(times[0], 4),
+            'rss_mb': round(max(s['maxrss_kb'] for s in samples) / 1024, 1),
+            'modules': samples[-1]['modules'],
+            'heavy_modules': samples[-1]['heavy'],
+        }
+    return results
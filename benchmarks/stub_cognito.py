@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Stub Cognito / JWKS Server
+
+Local stand-in for the Cognito endpoints the app calls:
+
+    GET  /.well-known/jwks.json   public key of a freshly generated RSA key
+    POST /oauth2/token            authorization_code and refresh_token grants
+    GET  /login, /logout          redirect straight back (no UI)
+
+Tokens are RS256 JWTs with the issuer/audience the app expects, so
+CognitoAuth.verify_token runs its normal verification path. Point the
+app at it with:
+
+    COGNITO_BASE_URL=http://127.0.0.1:<port>
+    COGNITO_JWKS_URL=http://127.0.0.1:<port>/.well-known/jwks.json
+"""
+
+import argparse
+import base64
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+KID = 'bench-key'
+
+
+def _b64url_uint(value):
+    data = value.to_bytes((value.bit_length() + 7) // 8, 'big')
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+class StubCognito:
+    """Token issuer plus the HTTP server that exposes it"""
+
+    def __init__(self, user_pool_id='bench-pool', client_id='bench-client',
+                 region='us-east-1', token_lifetime=3600):
+        self.user_pool_id = user_pool_id
+        self.client_id = client_id
+        self.issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
+        self.token_lifetime = token_lifetime
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        numbers = key.public_key().public_numbers()
+        self.jwks = {'keys': [{
+            'kty': 'RSA', 'alg': 'RS256', 'use': 'sig', 'kid': KID,
+            'n': _b64url_uint(numbers.n), 'e': _b64url_uint(numbers.e),
+        }]}
+
+        # refresh_token -> username, so refresh grants keep the same identity
+        self.refresh_tokens = {}
+        self.token_requests = {'authorization_code': 0, 'refresh_token': 0}
+        self._lock = threading.Lock()
+        self.server = None
+
+    def issue_tokens(self, username, include_refresh=True):
+        now = int(time.time())
+        claims = {
+            'sub': f"sub-{username}",
+            'aud': self.client_id,
+            'iss': self.issuer,
+            'iat': now,
+            'exp': now + self.token_lifetime,
+            'token_use': 'id',
+            'cognito:username': username,
+            'email': f"{username}@example.com",
+            'email_verified': True,
+            'name': username.title(),
+        }
+        id_token = jwt.encode(claims, self.private_pem, algorithm='RS256', headers={'kid': KID})
+        access_token = jwt.encode(dict(claims, token_use='access'), self.private_pem,
+                                  algorithm='RS256', headers={'kid': KID})
+        tokens = {
+            'id_token': id_token,
+            'access_token': access_token,
+            'expires_in': self.token_lifetime,
+            'token_type': 'Bearer',
+        }
+        if include_refresh:
+            refresh_token = secrets.token_urlsafe(32)
+            with self._lock:
+                self.refresh_tokens[refresh_token] = username
+            tokens['refresh_token'] = refresh_token
+        return tokens
+
+    def handle_token_request(self, form):
+        grant = form.get('grant_type')
+        with self._lock:
+            if grant in self.token_requests:
+                self.token_requests[grant] += 1
+        if grant == 'authorization_code':
+            # The code doubles as the username so callers can log in as anyone
+            return 200, self.issue_tokens(form.get('code') or 'benchuser')
+        if grant == 'refresh_token':
+            username = self.refresh_tokens.get(form.get('refresh_token'))
+            if not username:
+                return 400, {'error': 'invalid_grant'}
+            return 200, self.issue_tokens(username, include_refresh=False)
+        return 400, {'error': 'unsupported_grant_type'}
+
+    def start(self, host='127.0.0.1', port=0):
+        """Serve in a background thread; returns the base URL"""
+        self.server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def app_env(self):
+        """Environment variables that point the app at this stub"""
+        return {
+            'COGNITO_USER_POOL_ID': self.user_pool_id,
+            'COGNITO_CLIENT_ID': self.client_id,
+            'COGNITO_DOMAIN': urlparse(self.base_url).netloc,
+            'COGNITO_BASE_URL': self.base_url,
+            'COGNITO_JWKS_URL': f"{self.base_url}/.well-known/jwks.json",
+        }
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def _make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/.well-known/jwks.json':
+                self._send_json(200, stub.jwks)
+            elif url.path in ('/login', '/logout'):
+                query = parse_qs(url.query)
+                target = (query.get('redirect_uri') or query.get('logout_uri') or ['/'])[0]
+                self.send_response(302)
+                self.send_header('Location', target)
+                self.end_headers()
+            else:
+                self._send_json(404, {'error': 'not_found'})
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/oauth2/token':
+                self._send_json(404, {'error': 'not_found'})
+                return
+            length = int(self.headers.get('Content-Length', 0))
+            form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+            status, payload = stub.handle_token_request(form)
+            self._send_json(status, payload)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local stub Cognito/JWKS server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--token-lifetime', type=int, default=3600, help='ID token lifetime in seconds')
+    args = parser.parse_args()
+
+    stub = StubCognito(token_lifetime=args.token_lifetime)
+    stub.start(args.host, args.port)
+    print(f"Stub Cognito listening on {stub.base_url}")
+    for key, value in stub.app_env().items():
+        print(f"{key}={value}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Stub Offboarding Connectors
+
+One local HTTP server standing in for several security tools, for
+exercising scripts/offboard.py without touching real systems. Each
+system lives under its own path prefix:
+
+    GET    /<system>/users/<email>   {"id": ...} or 404
+    DELETE /<system>/users/<id>      204, or 404 if already removed
+
+Per system there is a fixed latency and an optional number of leading
+503 responses (to exercise retries). write_config() produces a matching
+connector configuration for offboard.py --config.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+DEFAULT_SYSTEMS = {
+    'okta': {'latency': 0.20},
+    'github': {'latency': 0.35},
+    'slack': {'latency': 0.15, 'fail_first': 1},
+    'crowdstrike': {'latency': 0.50},
+    'vpn': {'latency': 0.10},
+}
+
+
+class StubConnectors:
+    """Fake user directories for a set of systems plus the HTTP server"""
+
+    def __init__(self, systems=None, users=('departing.user@example.com',)):
+        self.systems = {name: dict(spec) for name, spec in (systems or DEFAULT_SYSTEMS).items()}
+        # system -> {email: account id}
+        self.accounts = {name: {email: f"{name}-{i}" for i, email in enumerate(users, 1)}
+                         for name in self.systems}
+        self.failures_left = {name: spec.get('fail_first', 0) for name, spec in self.systems.items()}
+        self.requests = {name: 0 for name in self.systems}
+        self.idempotency_keys = {name: set() for name in self.systems}
+        self._lock = threading.Lock()
+        self.server = None
+
+    def handle(self, method, path, headers):
+        parts = [unquote(p) for p in urlparse(path).path.strip('/').split('/')]
+        if len(parts) != 3 or parts[0] not in self.systems or parts[1] != 'users':
+            return 404, {'error': 'not_found'}
+        system, _, key = parts
+
+        time.sleep(self.systems[system].get('latency', 0))
+
+        with self._lock:
+            self.requests[system] += 1
+            if headers.get('Idempotency-Key'):
+                self.idempotency_keys[system].add(headers['Idempotency-Key'])
+            if self.failures_left[system] > 0:
+                self.failures_left[system] -= 1
+                return 503, {'error': 'unavailable'}
+
+            accounts = self.accounts[system]
+            if method == 'GET':
+                if key in accounts:
+                    return 200, {'id': accounts[key], 'email': key}
+                return 404, {'error': 'not_found'}
+            if method == 'DELETE':
+                for email, account_id in list(accounts.items()):
+                    if account_id == key:
+                        del accounts[email]
+                        return 204, None
+                return 404, {'error': 'not_found'}
+        return 405, {'error': 'method_not_allowed'}
+
+    def start(self, host='127.0.0.1', port=0):
+        """Serve in a background thread; returns the base URL"""
+        self.server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def connector_config(self, timeout=5, retries=2, backoff=0.05):
+        return {
+            'defaults': {'timeout': timeout, 'retries': retries, 'backoff': backoff},
+            'connectors': [{
+                'name': name,
+                'type': 'http',
+                'base_url': f"{self.base_url}/{name}",
+                'lookup': {'method': 'GET', 'path': '/users/{email}'},
+                'deprovision': {'method': 'DELETE', 'path': '/users/{id}'},
+                'absent_on_404': True,
+            } for name in self.systems],
+        }
+
+    def write_config(self, path, **kwargs):
+        with open(path, 'w') as f:
+            json.dump(self.connector_config(**kwargs), f, indent=2)
+        return path
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def _make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _handle(self):
+            length = int(self.headers.get('Content-Length', 0))
+            if length:
+                self.rfile.read(length)
+            status, payload = stub.handle(self.command, self.path, self.headers)
+            body = json.dumps(payload).encode() if payload is not None else b''
+            self.send_response(status)
+            if body:
+                self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_DELETE = do_POST = _handle
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run stub offboarding connectors')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--config', default='offboarding_stub.json',
+                        help='Where to write the matching connector configuration')
+    parser.add_argument('--user', action='append', default=None,
+                        help='Email with an account on every system (repeatable)')
+    args = parser.parse_args()
+
+    stub = StubConnectors(users=args.user or ('departing.user@example.com',))
+    stub.start(args.host, args.port)
+    stub.write_config(args.config)
+    print(f"Stub connectors listening on {stub.base_url}")
+    print(f"Run: python app/scripts/offboard.py --config {args.config} --email <email> [--fanged]")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -140,16 +140,36 @@ resource "aws_security_group" "app_sg" {
   }
 }
 
+resource "aws_security_group" "worker_sg" {
+  name        = "${var.project_name}-worker-sg"
+  description = "Allow SSH to queue workers; they only make outbound connections"
+  vpc_id      = aws_vpc.main.id
+
+  ingress {
+    from_port   = 22
+    to_port     = 22
+    protocol    = "tcp"
+    cidr_blocks = ["0.0.0.0/0"] # WARNING: Open to the world. Restrict to your IP for production.
+  }
+
+  egress {
+    from_port   = 0
+    to_port     = 0
+    protocol    = "-1"
+    cidr_blocks = ["0.0.0.0/0"]
+  }
+}
+
 resource "aws_security_group" "db_sg" {
   name        = "${var.project_name}-db-sg"
-  description = "Allow MySQL traffic from the app server"
+  description = "Allow MySQL traffic from the app server and workers"
   vpc_id      = aws_vpc.main.id
 
   ingress {
     from_port       = 3306
     to_port         = 3306
     protocol        = "tcp"
-    security_groups = [aws_security_group.app_sg.id]
+    security_groups = [aws_security_group.app_sg.id, aws_security_group.worker_sg.id]
   }
 
   egress {
@@ -241,6 +261,8 @@ resource "aws_instance" "app_server" {
     app_dir     = "/opt/automation-ui"
     domain_name = var.domain_name
     ssl_email   = var.ssl_email != "" ? var.ssl_email : "admin@${var.domain_name}"
+    # With worker instances the app server only queues runs (see app/job_queue.py)
+    execution_mode = var.worker_count > 0 ? "queue" : "inline"
   })
 
   root_block_device {
@@ -257,6 +279,36 @@ resource "aws_instance" "app_server" {
   }
 }
 
+resource "aws_instance" "worker" {
+  count                  = var.worker_count
+  ami                    = data.aws_ami.amazon_linux.id
+  instance_type          = var.worker_instance_type
+  subnet_id              = aws_subnet.public.id
+  vpc_security_group_ids = [aws_security_group.worker_sg.id]
+  iam_instance_profile   = aws_iam_instance_profile.ec2_profile.name
+  key_name               = aws_key_pair.generated_key.key_name
+  user_data = templatefile("${path.module}/worker_user_data.sh", {
+    secret_arn       = aws_secretsmanager_secret.app_secrets.arn
+    aws_region       = var.aws_region
+    app_dir          = "/opt/automation-ui"
+    worker_processes = var.worker_processes
+  })
+
+  root_block_device {
+    volume_size = var.ec2_root_volume_size
+  }
+
+  # The app server creates the jobs table
+  depends_on = [
+    aws_secretsmanager_secret_version.app_secrets_version,
+    aws_instance.app_server
+  ]
+
+  tags = {
+    Name = "${var.project_name}-worker-${count.index + 1}"
+  }
+}
+
 data "aws_availability_zones" "available" {}
 
 data "aws_ami" "amazon_linux" {
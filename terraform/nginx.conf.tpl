@@ -42,6 +42,26 @@ server {
     access_log /var/log/nginx/automation-ui-access.log;
     error_log /var/log/nginx/automation-ui-error.log;
 
+    # Fingerprinted build output (npm run build): cache forever, never hits Gunicorn
+    location /static/dist/ {
+        alias ${app_dir}/app/static/dist/;
+        gzip_static on;
+        include /etc/nginx/automation-ui.d/*.conf;
+
+        add_header Cache-Control "public, max-age=31536000, immutable" always;
+        add_header Strict-Transport-Security "max-age=31536000; includeSubDomains" always;
+        add_header X-Content-Type-Options "nosniff" always;
+        access_log off;
+    }
+
+    # Remaining unhashed static files
+    location /static/ {
+        alias ${app_dir}/app/static/;
+        gzip_static on;
+        expires 1h;
+        access_log off;
+    }
+
     # Proxy to Flask app
     location / {
         proxy_pass http://127.0.0.1:5000;
@@ -61,6 +81,19 @@ server {
         proxy_read_timeout 60s;
     }
 
+    # Inline runs (up to 5 min) and batches answer only when they are done
+    location /api/run {
+        proxy_pass http://127.0.0.1:5000;
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+
+        proxy_connect_timeout 60s;
+        proxy_send_timeout 60s;
+        proxy_read_timeout 3600s;
+    }
+
     # Increase max upload size if needed
     client_max_body_size 10M;
 }
@@ -13,6 +13,11 @@ output "ec2_public_ip" {
   value       = aws_instance.app_server.public_ip
 }
 
+output "worker_private_ips" {
+  description = "Private IP addresses of the queue worker instances."
+  value       = aws_instance.worker[*].private_ip
+}
+
 output "dns_configuration" {
   description = "DNS configuration instructions for your domain registrar."
   value = <<-EOT
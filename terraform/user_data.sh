@@ -22,6 +22,8 @@ python3 -m pip install certbot certbot-nginx
 # Define app directory
 APP_DIR="/opt/automation-ui"
 DOMAIN_NAME="${domain_name}"
+# Gunicorn threads per worker; the login guard keeps bcrypt logins below this
+WEB_THREADS=4
 
 # Get secrets from AWS Secrets Manager
 SECRET_ARN="${secret_arn}"
@@ -75,6 +77,7 @@ DB_NAME=$${DB_NAME}
 DB_USER=$${DB_USER}
 DB_PASSWORD=$${DB_PASSWORD}
 SECRET_KEY=$${SECRET_KEY}
+EXECUTION_MODE=${execution_mode}
 EOF
 
 # Change ownership of app directory first so ec2-user can install packages
@@ -120,10 +123,18 @@ EnvironmentFile=$${APP_DIR}/app/.env
 WorkingDirectory=$${APP_DIR}/app
 Environment="PATH=/home/ec2-user/.local/bin:/usr/local/bin:/usr/bin:/bin"
 Environment="PYTHONPATH=/home/ec2-user/.local/lib/python3.9/site-packages"
-ExecStart=/usr/bin/python3 -m gunicorn --workers 3 --bind 127.0.0.1:5000 --timeout 120 --access-logfile - --error-logfile - app:app
+Environment="WEB_THREADS=$${WEB_THREADS}"
+# gthread workers: while one thread waits on bcrypt (app/auth/login_guard.py)
+# or a subprocess, the worker's other threads keep serving requests
+ExecStart=/usr/bin/python3 -m gunicorn --workers 3 --worker-class gthread --threads $${WEB_THREADS} --bind 127.0.0.1:5000 --timeout 120 --access-logfile - --error-logfile - app:app
 Restart=always
 RestartSec=10
 
+# Hand the unit's cgroup subtree to the app so each automation run gets
+# its own cgroup with CPU/memory/IO limits (see app/resource_limits.py)
+Delegate=yes
+Environment="AUTOMATION_CGROUPS=1"
+
 # Security settings
 NoNewPrivileges=true
 PrivateTmp=true
@@ -160,6 +171,15 @@ echo "Configuring Nginx..."
 # Create directory for Let's Encrypt challenges
 mkdir -p /var/www/certbot
 
+# Optional per-site snippets included by the static locations. Serve the
+# precompressed .br assets when the ngx_brotli static module is installed.
+mkdir -p /etc/nginx/automation-ui.d
+BROTLI_MODULE=/usr/lib64/nginx/modules/ngx_http_brotli_static_module.so
+if [ -f "$BROTLI_MODULE" ]; then
+    echo "load_module $BROTLI_MODULE;" > /usr/share/nginx/modules/mod-http-brotli-static.conf
+    echo "brotli_static on;" > /etc/nginx/automation-ui.d/brotli.conf
+fi
+
 # Create initial Nginx configuration (HTTP only for Let's Encrypt verification)
 cat > /etc/nginx/conf.d/automation-ui.conf << 'NGINXCONF'
 server {
@@ -170,6 +190,18 @@ server {
         root /var/www/certbot;
     }
 
+    location /static/dist/ {
+        alias ${app_dir}/app/static/dist/;
+        gzip_static on;
+        include /etc/nginx/automation-ui.d/*.conf;
+        add_header Cache-Control "public, max-age=31536000, immutable";
+    }
+
+    location /static/ {
+        alias ${app_dir}/app/static/;
+        expires 1h;
+    }
+
     location / {
         proxy_pass http://127.0.0.1:5000;
         proxy_set_header Host $host;
@@ -177,6 +209,16 @@ server {
         proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
         proxy_set_header X-Forwarded-Proto $scheme;
     }
+
+    # Inline runs (up to 5 min) and batches answer only when they are done
+    location /api/run {
+        proxy_pass http://127.0.0.1:5000;
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+        proxy_read_timeout 3600s;
+    }
 }
 NGINXCONF
 
@@ -246,6 +288,26 @@ server {
     access_log /var/log/nginx/automation-ui-access.log;
     error_log /var/log/nginx/automation-ui-error.log;
 
+    # Fingerprinted build output (npm run build): cache forever, never hits Gunicorn
+    location /static/dist/ {
+        alias ${app_dir}/app/static/dist/;
+        gzip_static on;
+        include /etc/nginx/automation-ui.d/*.conf;
+
+        add_header Cache-Control "public, max-age=31536000, immutable" always;
+        add_header Strict-Transport-Security "max-age=31536000; includeSubDomains" always;
+        add_header X-Content-Type-Options "nosniff" always;
+        access_log off;
+    }
+
+    # Remaining unhashed static files
+    location /static/ {
+        alias ${app_dir}/app/static/;
+        gzip_static on;
+        expires 1h;
+        access_log off;
+    }
+
     location / {
         proxy_pass http://127.0.0.1:5000;
         proxy_set_header Host $host;
@@ -262,6 +324,19 @@ server {
         proxy_read_timeout 60s;
     }
 
+    # Inline runs (up to 5 min) and batches answer only when they are done
+    location /api/run {
+        proxy_pass http://127.0.0.1:5000;
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+
+        proxy_connect_timeout 60s;
+        proxy_send_timeout 60s;
+        proxy_read_timeout 3600s;
+    }
+
     client_max_body_size 10M;
 }
 NGINXHTTPS
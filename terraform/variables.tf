@@ -80,4 +80,22 @@ variable "ssl_email" {
   description = "Email address for Let's Encrypt SSL certificate notifications"
   type        = string
   default     = ""
+}
+
+variable "worker_count" {
+  description = "Number of worker instances running queued automations (0 = the app server runs them inline)."
+  type        = number
+  default     = 0
+}
+
+variable "worker_instance_type" {
+  description = "EC2 instance type for the worker instances."
+  type        = string
+  default     = "t2.micro"
+}
+
+variable "worker_processes" {
+  description = "Queue worker processes per worker instance (each runs WORKER_CONCURRENCY jobs at once)."
+  type        = number
+  default     = 2
 }
\ No newline at end of file
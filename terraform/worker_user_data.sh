@@ -0,0 +1,121 @@
+#!/bin/bash -xe
+
+# Queue worker node: runs automations claimed from the MySQL jobs table
+# (app/worker.py). No web server; the app server enqueues the jobs.
+exec > >(tee /var/log/user-data.log|logger -t user-data -s 2>/dev/console) 2>&1
+
+echo "Installing dependencies on Amazon Linux 2023..."
+dnf update -y
+dnf install -y git python3-pip mariadb105 jq aws-cli
+
+APP_DIR="${app_dir}"
+SECRET_ARN="${secret_arn}"
+AWS_REGION="${aws_region}"
+WORKER_PROCESSES="${worker_processes}"
+
+get_secret() {
+    aws secretsmanager get-secret-value --secret-id $SECRET_ARN --region $AWS_REGION --query SecretString --output text
+}
+
+echo "Retrieving secrets from AWS Secrets Manager..."
+MAX_RETRIES=30
+RETRY_COUNT=0
+SECRETS_JSON=""
+
+while [ $RETRY_COUNT -lt $MAX_RETRIES ]; do
+    SECRETS_JSON=$(get_secret)
+    if [ $? -eq 0 ] && [ -n "$SECRETS_JSON" ]; then
+        echo "Successfully retrieved secrets."
+        break
+    fi
+    RETRY_COUNT=$((RETRY_COUNT + 1))
+    echo "Attempt $RETRY_COUNT/$MAX_RETRIES failed. Retrying in 10 seconds..."
+    sleep 10
+done
+
+if [ -z "$SECRETS_JSON" ]; then
+    echo "ERROR: Failed to retrieve secrets after $MAX_RETRIES attempts."
+    exit 1
+fi
+
+DB_HOST=$(echo "$SECRETS_JSON" | jq -r .db_host)
+DB_PORT=$(echo "$SECRETS_JSON" | jq -r .db_port)
+DB_NAME=$(echo "$SECRETS_JSON" | jq -r .db_name)
+DB_USER=$(echo "$SECRETS_JSON" | jq -r .db_username)
+DB_PASSWORD=$(echo "$SECRETS_JSON" | jq -r .db_password)
+SECRET_KEY=$(echo "$SECRETS_JSON" | jq -r .secret_key)
+GIT_REPO_URL=$(echo "$SECRETS_JSON" | jq -r .git_repo_url)
+
+cd /opt
+git clone $GIT_REPO_URL $APP_DIR
+cd $APP_DIR/app
+
+cat > .env << EOF
+DB_HOST=$${DB_HOST}
+DB_PORT=$${DB_PORT}
+DB_NAME=$${DB_NAME}
+DB_USER=$${DB_USER}
+DB_PASSWORD=$${DB_PASSWORD}
+SECRET_KEY=$${SECRET_KEY}
+EXECUTION_MODE=queue
+EOF
+
+chown -R ec2-user:ec2-user $APP_DIR
+
+echo "Installing Python dependencies..."
+sudo -u ec2-user pip3 install --user -r requirements.txt
+sudo -u ec2-user rm -rf /home/ec2-user/.cache/pip
+dnf clean all
+
+# The app server runs database_setup.sql; wait until the jobs table exists
+echo "Waiting for the jobs table..."
+while ! mysql -h $DB_HOST -u $DB_USER -p$DB_PASSWORD $DB_NAME -e "SELECT 1 FROM jobs LIMIT 1"; do
+    sleep 10
+done
+
+# One templated unit per worker process: automation-worker@1, @2, ...
+cat > /etc/systemd/system/automation-worker@.service << EOF
+[Unit]
+Description=Automation Queue Worker %i
+After=network.target
+
+[Service]
+User=ec2-user
+Group=ec2-user
+EnvironmentFile=$${APP_DIR}/app/.env
+WorkingDirectory=$${APP_DIR}/app
+Environment="PATH=/home/ec2-user/.local/bin:/usr/local/bin:/usr/bin:/bin"
+Environment="PYTHONPATH=/home/ec2-user/.local/lib/python3.9/site-packages"
+ExecStart=/usr/bin/python3 worker.py
+Restart=always
+RestartSec=10
+
+# SIGTERM lets running jobs finish; past the timeout they are killed and
+# another worker re-claims them once their lease expires
+KillSignal=SIGTERM
+TimeoutStopSec=330
+
+# Per-run cgroups with CPU/memory/IO limits (see app/resource_limits.py)
+Delegate=yes
+Environment="AUTOMATION_CGROUPS=1"
+
+NoNewPrivileges=true
+PrivateTmp=true
+StandardOutput=journal
+StandardError=journal
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+systemctl daemon-reload
+for i in $(seq 1 $WORKER_PROCESSES); do
+    systemctl enable --now automation-worker@$i.service
+done
+
+sleep 5
+systemctl status 'automation-worker@*' --no-pager || true
+
+echo "============================================"
+echo "Worker node ready: $WORKER_PROCESSES worker processes"
+echo "============================================"